@@ -9,7 +9,7 @@ The application is configured to handle the endpoint '/status'
 
 """
 from api.v1.views import app_views
-from flask import Flask
+from flask import Flask, request
 from flask_cors import CORS
 from models import storage
 from flask import jsonify
@@ -21,6 +21,15 @@ CORS(app, resources={r"/*": {"origins": "0.0.0.0"}})
 app.register_blueprint(app_views)
 
 
+@app.before_request
+def open_session():
+    """
+    Starts the storage session of the request, read-only for GET and HEAD
+    requests
+    """
+    storage.begin(readonly=request.method in ("GET", "HEAD"))
+
+
 @app.teardown_appcontext
 def close_flask(exception):
     """
@@ -5,8 +5,9 @@ actions
 """
 from models import storage
 from models.amenity import Amenity
-from flask import abort, jsonify, request
+from flask import Response, abort, jsonify, request
 from api.v1.views import app_views
+from api.v1.views.paging import paged, paginate
 
 
 @app_views.route('/amenities', methods=['GET', 'POST'], strict_slashes=False)
@@ -17,8 +18,10 @@ def get_amenities():
     POST: Creates a new amenity based on the provided JSON data.
     """
     if request.method == 'GET':
-        all_obj = storage.all(Amenity)
-        return jsonify([obj.to_dict() for obj in all_obj.values()]), 200
+        listing = storage.listing(Amenity) if not paged() else None
+        if listing is not None:
+            return Response(listing, 200, mimetype='application/json')
+        return paginate(Amenity)
 
     if request.method == 'POST':
         data = request.get_json()
@@ -62,5 +65,5 @@ def methos_amenities(amenity_id):
             if key not in ['id', 'created_at', 'updated_at']:
                 setattr(amenity, key, value)
 
-        storage.save()
+        amenity.save()
         return jsonify(amenity.to_dict()), 200
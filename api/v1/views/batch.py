@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""
+View creating and updating many objects of any class in one request
+"""
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from flask import abort, jsonify, request
+from api.v1.views import app_views
+
+classes = {"Amenity": Amenity, "City": City, "Place": Place,
+           "Review": Review, "State": State, "User": User}
+# dictionary - class name -> attributes a created object must have
+required = {"Amenity": ["name"], "City": ["state_id", "name"],
+            "Place": ["city_id", "user_id", "name"],
+            "Review": ["place_id", "user_id", "text"],
+            "State": ["name"], "User": ["email", "password"]}
+# dictionary - class name -> (attribute, class name) of its parents
+parents = {"City": [("state_id", "State")],
+           "Place": [("city_id", "City"), ("user_id", "User")],
+           "Review": [("place_id", "Place"), ("user_id", "User")]}
+
+
+def references(op):
+    """yields the (class name, id) pairs an operation refers to"""
+    if type(op) is not dict or op.get("class") not in classes or \
+            type(op.get("data")) is not dict:
+        return
+    name, data = op["class"], op["data"]
+    if op.get("method") == "PUT" or "id" in data:
+        yield name, op.get("id") if op.get("method") == "PUT" else data["id"]
+    if op.get("method") == "POST":
+        for attr, parent in parents.get(name, []):
+            yield parent, data.get(attr)
+
+
+def check(op, found, created):
+    """returns the status of an operation and what bulk_upsert() takes
+    for it, or its error status and message
+
+    found holds the stored objects the operations refer to and created
+    the ids of those created by the operations before it, by class name;
+    the id of a valid POST is added to created. The object of a POST is
+    built here, so that a value it rejects fails this operation alone.
+    """
+    if type(op) is not dict or type(op.get("data")) is not dict:
+        return 400, "Not a JSON"
+    if op.get("method") not in ("POST", "PUT"):
+        return 400, "Unknown method"
+    name, data = op.get("class"), op["data"]
+    if not isinstance(name, str) or name not in classes:
+        return 400, "Unknown class"
+    keys = [attr for attr, _ in parents.get(name, [])]
+    if op["method"] == "PUT":
+        id = op.get("id")
+        if not isinstance(id, str) or (id not in found[name] and
+                                       id not in created[name]):
+            return 404, "Not found"
+        value = {key: item for key, item in data.items()
+                 if key not in ['id', 'created_at', 'updated_at'] + keys}
+        value.update({"__class__": name, "id": id})
+        return 200, value
+    for attr in required[name]:
+        if attr not in data:
+            return 400, "Missing " + attr
+    for attr, parent in parents.get(name, []):
+        id = data[attr]
+        if not isinstance(id, str) or (id not in found[parent] and
+                                       id not in created[parent]):
+            return 404, "Not found"
+    if "id" in data:
+        if not isinstance(data["id"], str) or not data["id"]:
+            return 400, "Invalid id"
+        if data["id"] in found[name] or data["id"] in created[name]:
+            return 409, "Already exists"
+    value = dict(data, __class__=name)
+    try:
+        value["id"] = classes[name](**value).id
+    except (TypeError, ValueError) as e:
+        return 400, str(e)
+    created[name].add(value["id"])
+    return 201, value
+
+
+@app_views.route('/batch', methods=['POST'], strict_slashes=False)
+def batch():
+    """
+    Applies a list of POST and PUT operations with a single save
+
+    Each operation is {"method": "POST", "class": <class name>, "data":
+    {...}} or {"method": "PUT", "class": <class name>, "id": <id>, "data":
+    {...}}. The objects they refer to are looked up once, by class, and
+    an operation may refer to an object an earlier one creates with its
+    id. Invalid operations are skipped, and the response lists the
+    status of every operation in order.
+    """
+    ops = request.get_json()
+    if ops is None:
+        abort(400, "Not a JSON")
+    if type(ops) is not list:
+        abort(400, "Not a list")
+
+    wanted = {name: set() for name in classes}
+    for op in ops:
+        for name, id in references(op):
+            if isinstance(id, str):
+                wanted[name].add(id)
+    found = {name: storage.get_many(classes[name], ids) if ids else {}
+             for name, ids in wanted.items()}
+
+    created = {name: set() for name in classes}
+    results = []
+    values = []
+    for op in ops:
+        status, value = check(op, found, created)
+        if status >= 400:
+            results.append({"status": status, "error": value})
+        else:
+            results.append({"status": status, "id": value["id"]})
+            values.append(value)
+    if values:
+        storage.bulk_upsert(values)
+    return jsonify(results), 200
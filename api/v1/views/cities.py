@@ -16,9 +16,8 @@ def get_cities(state_id):
         abort(404)
 
     if request.method == 'GET':
-        all_cities = storage.all('City')
-        cities = [city.to_dict() for city in all_cities.values()
-                  if city.state_id == state_id]
+        all_cities = storage.filter(City, state_id=state_id)
+        cities = [city.to_dict() for city in all_cities.values()]
         return jsonify(cities), 200
 
     if request.method == 'POST':
@@ -55,5 +54,5 @@ def method_city(city_id):
         for key, value in data.items():
             if key not in ['id', 'created_at', 'updated_at']:
                 setattr(city, key, value)
-        storage.save()
+        city.save()
         return jsonify(city.to_dict()), 200
@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""
+Keyset pagination and streaming of the list endpoints
+"""
+from models import storage
+from flask import Response, abort, jsonify, request, stream_with_context
+from flask import url_for
+import json
+
+# int - objects in a page when only `after` is given
+default_limit = 100
+# int - most objects in a page
+max_limit = 1000
+# int - objects read from storage per chunk of a streamed list
+chunk = 500
+
+
+def paged():
+    """returns True if the request asks for a single page"""
+    return 'limit' in request.args or 'after' in request.args
+
+
+def paginate(cls, **criteria):
+    """
+    Returns the response listing the objects of cls matching criteria
+
+    With a `limit` or an `after` parameter the response is one page of
+    objects in id order, those whose id comes after `after`, and a Link
+    header gives the URL of the next page while there may be one. Without
+    them every object is listed, streamed in chunks as it is serialized.
+    """
+    if not paged():
+        return Response(stream_with_context(stream(cls, criteria)), 200,
+                        mimetype='application/json')
+    limit = request.args.get('limit')
+    after = request.args.get('after')
+    try:
+        limit = default_limit if limit is None else int(limit)
+    except ValueError:
+        abort(400, 'Invalid limit')
+    if limit < 1:
+        abort(400, 'Invalid limit')
+    limit = min(limit, max_limit)
+    objs = storage.page(cls, limit, after, **criteria)
+    response = jsonify([obj.to_dict() for obj in objs])
+    if len(objs) == limit:
+        args = dict(request.view_args or {}, limit=limit, after=objs[-1].id)
+        response.headers['Link'] = '<{}>; rel="next"'.format(
+            url_for(request.endpoint, **args))
+    return response
+
+
+def stream(cls, criteria):
+    """yields the JSON array of the objects of cls matching criteria"""
+    yield '['
+    after = None
+    while True:
+        objs = storage.page(cls, chunk, after, **criteria)
+        if objs:
+            text = ','.join(json.dumps(obj.to_dict()) for obj in objs)
+            yield text if after is None else ',' + text
+        if len(objs) < chunk:
+            break
+        after = objs[-1].id
+    yield ']'
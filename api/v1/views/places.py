@@ -9,6 +9,7 @@ from models.city import City
 from models.user import User
 from flask import abort, jsonify, request
 from api.v1.views import app_views
+from api.v1.views.paging import paginate
 
 
 @app_views.route('/cities/<city_id>/places', methods=['GET', 'POST'],
@@ -22,9 +23,7 @@ def get_places(city_id):
         abort(404)
 
     if request.method == 'GET':
-        all_objs = storage.all(Place)
-        places = [obj.to_dict() for obj in all_objs.values()]
-        return jsonify(places), 200
+        return paginate(Place, city_id=city_id)
 
     if request.method == 'POST':
         data = request.get_json()
@@ -73,5 +72,5 @@ def methods_places(place_id):
                            'updated_at', 'user_id', 'place_id']:
                 setattr(place, key, value)
 
-        storage.save()
+        place.save()
         return jsonify(place.to_dict()), 200
@@ -7,8 +7,9 @@ from models import storage
 from models.place import Place
 from models.user import User
 from models.review import Review
-from flask import abort, jsonify, request
+from flask import Response, abort, jsonify, request
 from api.v1.views import app_views
+from api.v1.views.paging import paged, paginate
 
 
 @app_views.route('/places/<place_id>/reviews', methods=['GET', 'POST'],
@@ -22,10 +23,11 @@ def get_reviews(place_id):
         abort(404)
 
     if request.method == 'GET':
-        all_objs = storage.all(Review)
-        x = [obj.to_dict() for obj in all_objs.values()
-             if obj.place_id == place_id]
-        return jsonify(x), 200
+        listing = None if paged() else \
+            storage.listing(Review, 'place_id', place_id)
+        if listing is not None:
+            return Response(listing, 200, mimetype='application/json')
+        return paginate(Review, place_id=place_id)
 
     if request.method == 'POST':
         data = request.get_json()
@@ -75,5 +77,5 @@ def method_reviews(review_id):
                            'user_id', 'place_id']:
                 setattr(review, key, value)
 
-        storage.save()
+        review.save()
         return jsonify(review.to_dict()), 200
@@ -5,6 +5,7 @@ actions
 """
 from flask import abort, jsonify, request
 from api.v1.views import app_views
+from api.v1.views.paging import paginate
 from models import storage
 from models.state import State
 
@@ -15,8 +16,7 @@ def get_states():
     Get all states or create a new state.
     """
     if request.method == 'GET':
-        all_objs = storage.all(State)
-        return jsonify([obj.to_dict() for obj in all_objs.values()]), 200
+        return paginate(State)
 
     if request.method == 'POST':
         data = request.get_json()
@@ -60,5 +60,5 @@ def method_states(state_id):
             if key not in ['id', 'created_at', 'updated_at']:
                 setattr(states, key, value)
 
-        storage.save()
+        states.save()
         return jsonify(states.to_dict()), 200
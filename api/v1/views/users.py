@@ -5,8 +5,9 @@ actions
 """
 from models import storage
 from models.user import User
-from flask import abort, jsonify, request
+from flask import Response, abort, jsonify, request
 from api.v1.views import app_views
+from api.v1.views.paging import paged, paginate
 
 
 @app_views.route('/users', methods=['GET', 'POST'], strict_slashes=False)
@@ -15,8 +16,10 @@ def get_users():
     Get all users or create a new user.
     """
     if request.method == 'GET':
-        all_objs = storage.all(User)
-        return jsonify([obj.to_dict() for obj in all_objs.values()]), 200
+        listing = storage.listing(User) if not paged() else None
+        if listing is not None:
+            return Response(listing, 200, mimetype='application/json')
+        return paginate(User)
 
     if request.method == 'POST':
         data = request.get_json()
@@ -62,5 +65,5 @@ def method_users(user_id):
             if key not in ['id', 'created_at', 'updated_at']:
                 setattr(user, key, value)
 
-        storage.save()
+        user.save()
         return jsonify(user.to_dict()), 200
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Benchmark of FileStorage save and reload with each snapshot codec
+
+Usage: python3 -m benchmarks.bench_codec [reviews]
+"""
+
+import models
+from models.engine.codec import codecs
+from models.engine.file_storage import FileStorage
+from models.review import Review
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+
+def main(reviews=100000):
+    """saves and reloads the same reviews with every codec"""
+    tmp = tempfile.mkdtemp()
+    storage = models.storage
+    for i in range(reviews):
+        storage.new(Review(text="Nice", place_id="p{:d}".format(i % 1000),
+                           user_id="u{:d}".format(i % 1000)))
+    try:
+        for name, codec in codecs.items():
+            path = os.path.join(tmp, "file." + name)
+            FileStorage._FileStorage__file_path = path
+            FileStorage._FileStorage__codec = codec
+            start = time.perf_counter()
+            storage.save()
+            saved = time.perf_counter() - start
+            FileStorage._FileStorage__objects.clear()
+            FileStorage._FileStorage__classes.clear()
+            FileStorage._FileStorage__relations.clear()
+            FileStorage._FileStorage__references.clear()
+            FileStorage._FileStorage__fragments.clear()
+            start = time.perf_counter()
+            storage.reload()
+            loaded = time.perf_counter() - start
+            print("{:6s} save {:6.2f}s reload {:6.2f}s size {:6.1f} MB"
+                  .format(name, saved, loaded, os.path.getsize(path) / 1e6))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Memory benchmark of the regular and the compact file storage models
+
+Usage: python3 -m benchmarks.bench_compact [objects]
+"""
+
+from models.engine.compact import compact_class
+from models.place import Place
+from models.review import Review
+import sys
+import tracemalloc
+import uuid
+
+
+def entries(n):
+    """returns n review and n place dicts as read from file.json"""
+    items = []
+    for i in range(n):
+        items.append(Review(place_id=str(uuid.uuid4()),
+                            user_id=str(uuid.uuid4()),
+                            text="Great stay").to_dict())
+        items.append(Place(city_id=str(uuid.uuid4()),
+                           user_id=str(uuid.uuid4()), name="Loft",
+                           number_rooms=2, latitude=37.7).to_dict())
+    return items
+
+
+def measure(items, compact):
+    """returns the bytes held by the objects built from items"""
+    classes = {"Review": Review, "Place": Place}
+    if compact:
+        classes = {name: compact_class(cls) for name, cls in classes.items()}
+    tracemalloc.start()
+    objs = [classes[item["__class__"]](**item) for item in items]
+    for obj in objs:
+        obj.to_dict()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, len(objs)
+
+
+def main(n=50000):
+    """prints the memory used by both representations"""
+    items = entries(n)
+    regular, count = measure(items, False)
+    compact, count = measure(items, True)
+    print("objects  {:d}".format(count))
+    print("regular  {:8.1f} MB {:6.0f} B/object".format(
+        regular / 2 ** 20, regular / count))
+    print("compact  {:8.1f} MB {:6.0f} B/object".format(
+        compact / 2 ** 20, compact / count))
+    print("saved    {:.0%}".format(1 - compact / regular))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""
+Memory benchmark of FileStorage.reload on a dataset sharing many ids
+
+Usage: python3 -m benchmarks.bench_intern [reviews]
+"""
+
+import json
+import models
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+from models.user import User
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+
+def dataset(path, reviews):
+    """writes 1000 users, 1000 places and their reviews to path"""
+    users = [User(email="{:d}@hbnb.io".format(i)) for i in range(1000)]
+    places = [Place(name="Place", city_id="0", user_id=random.choice(
+        users).id) for i in range(1000)]
+    objs = users + places + [Review(text="Nice", place_id=random.choice(
+        places).id, user_id=random.choice(users).id) for i in range(reviews)]
+    with open(path, "w") as f:
+        json.dump({obj.__class__.__name__ + "." + obj.id: obj.to_dict()
+                   for obj in objs}, f)
+
+
+def main(reviews=100000):
+    """reloads the dataset and prints the memory it takes"""
+    path = os.path.join(tempfile.mkdtemp(), "file.json")
+    dataset(path, reviews)
+    FileStorage._FileStorage__file_path = path
+    storage = models.storage
+    tracemalloc.start()
+    storage.reload()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    ids = set()
+    for review in storage.all(Review).values():
+        ids.add(id(review.place_id))
+        ids.add(id(review.user_id))
+    print("objects            {:d}".format(storage.count()))
+    print("reloaded           {:.1f} MB".format(size / 2 ** 20))
+    print("foreign key copies {:d}".format(len(ids)))
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+Microbenchmark of the BaseModel timestamp codec against strptime/strftime
+
+Usage: python3 -m benchmarks.bench_timestamps [iterations]
+"""
+
+from datetime import datetime, timedelta
+from models.base_model import format_time, parse_time, time
+import random
+import sys
+import timeit
+
+
+def samples(n):
+    """returns n random datetimes and their text in the `time` format"""
+    start = datetime(2000, 1, 1)
+    values = [start + timedelta(microseconds=random.randrange(10 ** 16))
+              for i in range(n)]
+    return values, [value.strftime(time) for value in values]
+
+
+def main(iterations=100000):
+    """times both codecs on the same samples and checks they agree"""
+    values, texts = samples(iterations)
+    assert [format_time(v) for v in values] == texts
+    assert [parse_time(t) for t in texts] == values
+    runs = [
+        ("parse  strptime", lambda: [datetime.strptime(t, time)
+                                     for t in texts]),
+        ("parse  codec", lambda: [parse_time(t) for t in texts]),
+        ("format strftime", lambda: [v.strftime(time) for v in values]),
+        ("format codec", lambda: [format_time(v) for v in values]),
+    ]
+    timings = {}
+    for name, run in runs:
+        timings[name] = min(timeit.repeat(run, number=1, repeat=3))
+        print("{:16s} {:8.1f} ns/op".format(
+            name, timings[name] / iterations * 1e9))
+    print("parse speedup  {:.1f}x".format(
+        timings["parse  strptime"] / timings["parse  codec"]))
+    print("format speedup {:.1f}x".format(
+        timings["format strftime"] / timings["format codec"]))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
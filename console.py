@@ -3,6 +3,7 @@
 
 import cmd
 # from datetime import datetime
+import json
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel
@@ -96,7 +97,7 @@ class HBNBCommand(cmd.Cmd):
             if len(args) > 1:
                 key = args[0] + "." + args[1]
                 if key in models.storage.all():
-                    models.storage.all().pop(key)
+                    models.storage.delete(models.storage.all()[key])
                     models.storage.save()
                 else:
                     print("** no instance found **")
@@ -160,6 +161,34 @@ class HBNBCommand(cmd.Cmd):
         else:
             print("** class doesn't exist **")
 
+    def do_bulk(self, arg):
+        """Creates or updates the instances listed in a JSON file
+
+        The file holds an array of dictionaries like those of to_dict(),
+        saved together with a single write, or not at all if one of them
+        is invalid.
+        """
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print("** file name missing **")
+            return False
+        try:
+            with open(args[0], encoding="utf-8") as f:
+                dicts = json.load(f)
+        except (OSError, ValueError):
+            print("** file can't be read **")
+            return False
+        if type(dicts) is not list or \
+                not all(type(value) is dict for value in dicts):
+            print("** file must hold a list of objects **")
+            return False
+        try:
+            keys = models.storage.bulk_upsert(dicts)
+        except ValueError as e:
+            print("** {} **".format(e))
+            return False
+        print(len(keys))
+
 
 if __name__ == '__main__':
     HBNBCommand().cmdloop()
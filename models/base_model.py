@@ -13,6 +13,32 @@ import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+
+def parse_time(text):
+    """returns the datetime written in the `time` format by format_time
+
+    Text laid out as `time` is parsed by datetime.fromisoformat, anything
+    else by strptime.
+    """
+    if len(text) == 26 and text[4:20:3] == "--T::." and text.isascii():
+        try:
+            value = datetime.fromisoformat(text)
+        except ValueError:
+            value = None
+        if value is not None and value.tzinfo is None:
+            return value
+    return datetime.strptime(text, time)
+
+
+def format_time(value):
+    """returns value.strftime(time), computed without strftime"""
+    if value.tzinfo is None and value.year >= 1000:
+        if value.microsecond:
+            return value.isoformat()
+        return value.isoformat(timespec="microseconds")
+    return value.strftime(time)
+
+
 if models.storage_t == "db":
     Base = declarative_base()
 else:
@@ -33,12 +59,12 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
-            else:
+                self.created_at = parse_time(kwargs["created_at"])
+            elif type(kwargs.get("created_at", None)) is not datetime:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
-            else:
+                self.updated_at = parse_time(kwargs["updated_at"])
+            elif type(kwargs.get("updated_at", None)) is not datetime:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
                 self.id = str(uuid.uuid4())
@@ -47,6 +73,13 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute and flags the instance as changed"""
+            super().__setattr__(name, value)
+            if getattr(self, "id", None) is not None:
+                models.storage.changed(self)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
@@ -62,9 +95,9 @@ class BaseModel:
         """returns a dictionary containing all keys/values of the instance"""
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
@@ -0,0 +1,24 @@
+#!/usr/bin/python3
+"""
+Storage engines of the models, and what their bulk writes share
+"""
+
+# tuple - attributes bulk_upsert() does not copy onto a stored object
+ignored = ("id", "created_at", "updated_at", "__class__")
+
+
+def upsert_key(i, value, classes):
+    """returns the class name and the id, or None, of the dictionary i of
+    a bulk_upsert(), ValueError if they are not valid
+
+    classes maps the class names the engine stores to their classes.
+    """
+    if type(value) is not dict:
+        raise ValueError("item {:d}: not a dictionary".format(i))
+    name = value.get("__class__")
+    if not isinstance(name, str) or name not in classes:
+        raise ValueError("item {:d}: unknown class {}".format(i, name))
+    id = value.get("id")
+    if id is not None and (not isinstance(id, str) or not id):
+        raise ValueError("item {:d}: invalid id".format(i))
+    return name, id
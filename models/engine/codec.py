@@ -0,0 +1,218 @@
+#!/usr/bin/python3
+"""
+Contains the codecs FileStorage snapshots are written with
+"""
+
+from datetime import datetime, timedelta
+import io
+import json
+from models.base_model import format_time, parse_time
+from models.engine import snapshot
+import struct
+
+# JSONEncoder - writes the attributes of binary records without spaces
+encoder = json.JSONEncoder(separators=(",", ":"))
+decoder = json.JSONDecoder()
+# bytes - first bytes of a snapshot written by BinaryCodec
+magic = b"HBNB\x00\x01"
+epoch = datetime(1970, 1, 1)
+microsecond = timedelta(microseconds=1)
+size = struct.Struct("<I")
+length = struct.Struct("<H")
+stamp = struct.Struct("<q")
+# integer - record length marking the end of a binary snapshot
+end = 0xFFFFFFFF
+# flags - what the fixed width part of a binary record holds
+uuid_id = 1
+created = 2
+updated = 4
+
+
+def uuid_text(data):
+    """returns the canonical text of the 16 bytes of a UUID"""
+    h = data.hex()
+    return "-".join((h[:8], h[8:12], h[12:16], h[16:20], h[20:]))
+
+
+def uuid_bytes(text):
+    """returns the 16 bytes of text if it is a canonical UUID, or None"""
+    if len(text) != 36:
+        return None
+    try:
+        data = bytes.fromhex(text.replace("-", ""))
+    except ValueError:
+        return None
+    if len(data) != 16 or uuid_text(data) != text:
+        return None
+    return data
+
+
+def sniff(f):
+    """returns the codec of the snapshot opened in binary mode as f
+
+    f is left positioned at the first entry; JSON snapshots are returned
+    wrapped in a text reader along with their codec.
+    """
+    if f.read(len(magic)) == magic:
+        return codecs["binary"], f
+    f.seek(0)
+    return codecs["json"], io.TextIOWrapper(f, encoding="utf-8")
+
+
+class JSONCodec:
+    """writes snapshots as one JSON object of <class name>.id -> to_dict()"""
+
+    name = "json"
+
+    def encode(self, key, obj):
+        """returns the entry of obj under key"""
+        return json.dumps(key) + ": " + json.dumps(obj.to_dict())
+
+    def convert(self, key, value):
+        """returns the entry of the decoded value under key"""
+        value = dict(value)
+        for attr in ("created_at", "updated_at"):
+            if isinstance(value.get(attr), datetime):
+                value[attr] = format_time(value[attr])
+        return json.dumps(key) + ": " + json.dumps(value)
+
+    def part(self, key, raw):
+        """returns the entry under key of a value read with raw=True"""
+        return json.dumps(key) + ": " + raw
+
+    def join(self, parts):
+        """returns the snapshot made of the entries in parts"""
+        return "{" + ", ".join(parts) + "}"
+
+    def decode(self, raw):
+        """returns the value of an entry read with raw=True"""
+        return json.loads(raw)
+
+    def iter(self, f, raw=False):
+        """yields the (key, value) pairs of the snapshot in f"""
+        return snapshot.iter_json(f, raw=raw)
+
+
+class BinaryCodec:
+    """writes snapshots as length prefixed binary records
+
+    A record is a flags byte, the class name, the id as 16 bytes when it
+    is a UUID, created_at and updated_at as signed microseconds since the
+    epoch, and the other attributes as compact JSON. The snapshot starts
+    with `magic` and ends with a record length of `end`, so a truncated
+    file is detected instead of read as a shorter one.
+    """
+
+    name = "binary"
+
+    def encode(self, key, obj):
+        """returns the entry of obj under key"""
+        value = obj.__dict__.copy()
+        value.pop("_sa_instance_state", None)
+        value["__class__"] = obj.__class__.__name__
+        return self.convert(key, value)
+
+    def convert(self, key, value):
+        """returns the entry of the decoded value under key"""
+        value = dict(value)
+        name = value.pop("__class__", None) or key.split(".", 1)[0]
+        id = value.pop("id")
+        flags = 0
+        data = uuid_bytes(id)
+        if data is not None:
+            flags |= uuid_id
+        else:
+            data = id.encode("utf-8")
+            data = length.pack(len(data)) + data
+        times = b""
+        for attr, flag in (("created_at", created), ("updated_at", updated)):
+            when = value.get(attr)
+            if type(when) is str:
+                try:
+                    when = parse_time(when)
+                except ValueError:
+                    continue
+                if format_time(when) != value[attr]:
+                    continue
+            if isinstance(when, datetime) and when.tzinfo is None:
+                flags |= flag
+                times += stamp.pack((when - epoch) // microsecond)
+                del value[attr]
+            elif isinstance(when, datetime):
+                value[attr] = format_time(when)
+        name = name.encode("utf-8")
+        rest = encoder.encode(value).encode("utf-8") if value else b""
+        record = b"".join((bytes((flags, len(name))), name, data, times,
+                           rest))
+        return size.pack(len(record)) + record
+
+    def part(self, key, raw):
+        """returns the entry under key of a value read with raw=True"""
+        return size.pack(len(raw)) + raw
+
+    def join(self, parts):
+        """returns the snapshot made of the entries in parts"""
+        return b"".join([magic] + parts + [size.pack(end)])
+
+    def key(self, record):
+        """returns the <class name>.id key of record"""
+        return self.header(record)[0]
+
+    def header(self, record):
+        """returns the key of record and the offset of its timestamps"""
+        flags = record[0]
+        pos = 2 + record[1]
+        name = record[2:pos].decode("utf-8")
+        if flags & uuid_id:
+            id = uuid_text(record[pos:pos + 16])
+            pos += 16
+        else:
+            n = length.unpack_from(record, pos)[0]
+            id = record[pos + 2:pos + 2 + n].decode("utf-8")
+            pos += 2 + n
+        return name + "." + id, pos
+
+    def decode(self, record):
+        """returns the value of an entry read with raw=True"""
+        key, pos = self.header(record)
+        flags = record[0]
+        times = {}
+        for attr, flag in (("created_at", created), ("updated_at", updated)):
+            if flags & flag:
+                times[attr] = epoch + microsecond * stamp.unpack_from(
+                    record, pos)[0]
+                pos += 8
+        value = decoder.raw_decode(record[pos:].decode("utf-8"))[0] \
+            if pos < len(record) else {}
+        name, value["id"] = key.split(".", 1)
+        value["__class__"] = name
+        value.update(times)
+        return value
+
+    def iter(self, f, raw=False):
+        """yields the (key, value) pairs of the snapshot in f"""
+        while True:
+            head = f.read(4)
+            if len(head) < 4:
+                raise ValueError("snapshot ends without its end marker")
+            n = size.unpack(head)[0]
+            if n == end:
+                if f.read(1):
+                    raise ValueError("data after the snapshot end marker")
+                return
+            record = f.read(n)
+            if len(record) < n:
+                raise ValueError("truncated snapshot record")
+            try:
+                if raw:
+                    key, value = self.key(record), record
+                else:
+                    value = self.decode(record)
+                    key = value["__class__"] + "." + value["id"]
+            except (struct.error, IndexError) as e:
+                raise ValueError("malformed snapshot record: {}".format(e))
+            yield key, value
+
+
+# dictionary - HBNB_FILE_CODEC value -> codec
+codecs = {"json": JSONCodec(), "binary": BinaryCodec()}
@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+"""
+Contains the read-only, memory mapped, columnar snapshots of a class
+"""
+
+import json
+import mmap
+from models.engine import snapshot
+import struct
+import sys
+
+# bytes - first bytes of a columnar snapshot
+magic = b"HBNBCOL1"
+header = struct.Struct("<8sQQ")
+offset = struct.Struct("<Q")
+# tuple - the columns of a snapshot, in file order
+columns = ("id", "key", "json")
+
+
+def pad(data):
+    """returns the zero bytes that align a block after data on 8 bytes"""
+    return b"\0" * (-len(data) % 8)
+
+
+def column(values, separator=b""):
+    """returns the offsets and the data of a column of bytes values
+
+    offsets[k] is where value k starts in the data and offsets[count] is
+    the length of the data plus that of the separator.
+    """
+    offsets = [0]
+    for value in values:
+        offsets.append(offsets[-1] + len(value) + len(separator))
+    data = separator.join(values)
+    return struct.pack("<{:d}Q".format(len(offsets)), *offsets), data
+
+
+def write(path, objs, source, attr=None):
+    """writes the columnar snapshot of objs to path
+
+    The rows are sorted on attr, or on the id when attr is None, so the
+    rows sharing a value are contiguous. The json column holds each
+    to_dict() serialized and separated by commas, so any run of rows is
+    already the inside of a JSON array.
+    """
+    rows = []
+    for obj in objs:
+        key = getattr(obj, attr, None) if attr is not None else obj.id
+        rows.append((key or "", obj.id, obj))
+    rows.sort(key=lambda row: (row[0], row[1]))
+    values = {
+        "id": [row[1].encode("utf-8") for row in rows],
+        "key": [row[0].encode("utf-8") for row in rows],
+        "json": [json.dumps(row[2].to_dict(), sort_keys=True,
+                            separators=(",", ":")).encode("utf-8")
+                 for row in rows]}
+    blocks = [header.pack(magic, len(rows), len(source)) + source]
+    blocks[0] += pad(blocks[0])
+    start = len(blocks[0]) + offset.size * len(columns)
+    starts = []
+    for name in columns:
+        offsets, data = column(values[name], b"," if name == "json" else b"")
+        starts.append(start)
+        block = offsets + data
+        blocks.append(block + pad(block))
+        start += len(blocks[-1])
+    blocks.insert(1, b"".join(offset.pack(n) for n in starts))
+    snapshot.write(path, b"".join(blocks))
+
+
+class Columnar:
+    """maps the columnar snapshot of a class read-only
+
+    The pages of the file are shared by every process mapping it, and the
+    ids and rows are read from them without being copied or rebuilt as
+    objects.
+    """
+
+    def __init__(self, path):
+        """maps the snapshot at path, ValueError if it is not one"""
+        if sys.byteorder != "little":
+            raise ValueError("offsets are read as little endian integers")
+        with open(path, "rb") as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self.__map)
+        if len(view) < header.size:
+            raise ValueError("not a columnar snapshot")
+        tag, self.count, size = header.unpack_from(view)
+        if tag != magic:
+            raise ValueError("not a columnar snapshot")
+        self.token = bytes(view[header.size:header.size + size])
+        start = header.size + size
+        start += -start % 8
+        self.__offsets = {}
+        self.__data = {}
+        for i, name in enumerate(columns):
+            pos = offset.unpack_from(view, start + i * offset.size)[0]
+            end = pos + offset.size * (self.count + 1)
+            self.__offsets[name] = view[pos:end].cast("Q")
+            length = self.__offsets[name][self.count]
+            self.__data[name] = view[end:end + length]
+
+    def value(self, name, k):
+        """returns the bytes of row k in column name, without copying"""
+        offsets = self.__offsets[name]
+        end = offsets[k + 1]
+        if name == "json":
+            end -= 1
+        return self.__data[name][offsets[k]:end]
+
+    def id(self, k):
+        """returns the id of row k, without copying"""
+        return self.value("id", k)
+
+    def bounds(self, value):
+        """returns the first and past the last row whose key is value"""
+        value = value.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self.value("key", mid)) < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+        hi = self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self.value("key", mid)) <= value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, lo
+
+    def rows(self, value=None):
+        """returns the JSON array of every row, or of those keyed by value"""
+        first, last = (0, self.count) if value is None else \
+            self.bounds(value)
+        if first == last:
+            return b"[]"
+        offsets = self.__offsets["json"]
+        data = self.__data["json"][offsets[first]:offsets[last] - 1]
+        return b"[" + data + b"]"
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+"""
+Contains the compact, slot based, variants of the file storage models
+"""
+
+import models
+
+# dictionary - model class -> its compact class
+compact_classes = {}
+
+
+def defaults(cls):
+    """returns the class attributes of cls that hold default values"""
+    values = {}
+    for klass in reversed(cls.__mro__[:-1]):
+        for name, value in vars(klass).items():
+            if not name.startswith("_") and not callable(value) and \
+                    not isinstance(value, (property, classmethod,
+                                           staticmethod)):
+                values[name] = value
+    return values
+
+
+def methods(cls):
+    """returns the methods and properties shared with the compact class"""
+    shared = {}
+    for klass in reversed(cls.__mro__[:-1]):
+        for name, value in vars(klass).items():
+            if name in ("__init__", "__setattr__", "__dict__",
+                        "__weakref__", "__module__", "__qualname__",
+                        "__doc__"):
+                continue
+            if callable(value) or isinstance(value, property):
+                shared[name] = value
+    return shared
+
+
+def compact_class(cls):
+    """returns the class keeping the attributes of cls in slots
+
+    Its instances have no per-instance dictionary until an attribute
+    outside the model's own, such as one set by the console update
+    command, is added. They report cls as their __class__, so keys,
+    isinstance(), to_dict() and __str__ behave as for cls instances.
+    """
+    if cls in compact_classes:
+        return compact_classes[cls]
+    values = defaults(cls)
+    slots = ("id", "created_at", "updated_at") + tuple(
+        name for name in values if name not in ("id", "created_at",
+                                                "updated_at"))
+
+    def __init__(self, *args, **kwargs):
+        """initializes the instance like the model class would"""
+        object.__setattr__(self, "_extra", None)
+        models.base_model.BaseModel.__init__(self, *args, **kwargs)
+
+    def __getattr__(self, name):
+        """returns the class default of an attribute never set"""
+        if name == "_extra":
+            raise AttributeError(name)
+        if name in values:
+            return values[name]
+        if self._extra is not None and name in self._extra:
+            return self._extra[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            cls.__name__, name))
+
+    def __setattr__(self, name, value):
+        """sets an attribute and flags the instance as changed"""
+        if name in slots:
+            object.__setattr__(self, name, value)
+        else:
+            if self._extra is None:
+                object.__setattr__(self, "_extra", {})
+            self._extra[name] = value
+        if getattr(self, "id", None) is not None:
+            models.storage.changed(self)
+
+    def __dict__(self):
+        """returns the attributes set on the instance, like vars()"""
+        attrs = {}
+        for name in slots:
+            try:
+                attrs[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        if self._extra:
+            attrs.update(self._extra)
+        return attrs
+
+    def __class__(self):
+        """returns the model class the instance stands for"""
+        return cls
+
+    namespace = methods(cls)
+    namespace.update({
+        "__slots__": slots + ("_extra",), "__module__": __name__,
+        "__qualname__": cls.__qualname__, "__doc__": cls.__doc__,
+        "__init__": __init__, "__getattr__": __getattr__,
+        "__setattr__": __setattr__, "__dict__": property(__dict__),
+        "__class__": property(__class__)})
+    compact_classes[cls] = type(cls.__name__, (object,), namespace)
+    return compact_classes[cls]
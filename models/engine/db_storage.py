@@ -3,54 +3,161 @@
 Contains the class DBStorage
 """
 
+from datetime import datetime
 # import models
 from models.amenity import Amenity
 from models.base_model import Base, BaseModel
 from models.city import City
+from models.engine import ignored, upsert_key
+from models.engine.pool import PoolStats, timed_pool
+from models.engine.routing import LastWrite, RoutingSession
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 # import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import create_engine, event, func, inspect, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import joinedload, scoped_session, selectinload
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# list - (variable, create_engine() option, type) of the pool settings
+pool_options = [("HBNB_MYSQL_POOL_SIZE", "pool_size", int),
+                ("HBNB_MYSQL_MAX_OVERFLOW", "max_overflow", int),
+                ("HBNB_MYSQL_POOL_TIMEOUT", "pool_timeout", float),
+                ("HBNB_MYSQL_POOL_RECYCLE", "pool_recycle", int)]
+# dictionary - eager loading strategy -> loader option of a relationship
+loaders = {"selectin": selectinload, "joined": joinedload}
+
+
+def engine_url():
+    """returns the database URL, HBNB_MYSQL_URL or built from its parts"""
+    url = getenv('HBNB_MYSQL_URL')
+    if url:
+        return url
+    return '{}://{}:{}@{}/{}'.format(getenv('HBNB_MYSQL_DRIVER',
+                                            'mysql+mysqldb'),
+                                     getenv('HBNB_MYSQL_USER'),
+                                     getenv('HBNB_MYSQL_PWD'),
+                                     getenv('HBNB_MYSQL_HOST'),
+                                     getenv('HBNB_MYSQL_DB'))
+
+
+def replica_urls():
+    """returns the URLs of the read replicas, from HBNB_MYSQL_REPLICA_URLS
+
+    The variable holds the URLs separated by commas, without it every
+    query runs on the primary database.
+    """
+    return [url.strip() for url in getenv('HBNB_MYSQL_REPLICA_URLS',
+                                          '').split(',') if url.strip()]
+
+
+def engine_options():
+    """returns the create_engine() pool options set in the environment
+
+    Pre-ping, which replaces the connections the server closed after its
+    wait_timeout, is on unless HBNB_MYSQL_POOL_PRE_PING is 0.
+    """
+    options = {"pool_pre_ping": getenv('HBNB_MYSQL_POOL_PRE_PING',
+                                       '1') != '0'}
+    for name, option, kind in pool_options:
+        value = getenv(name)
+        if value:
+            options[option] = kind(value)
+    return options
 
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    __stats = None
+    # float - seconds the row counts are cached for, 0 disables the cache
+    __count_ttl = float(getenv('HBNB_COUNT_TTL', '0'))
+    # float - seconds a session keeps reading from the primary after writing
+    __read_your_writes = float(getenv('HBNB_MYSQL_READ_YOUR_WRITES', '0'))
 
     def __init__(self):
         """Instantiate a DBStorage object"""
-        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
-        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
-        HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
-        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        self.__stats = PoolStats()
+        self.__engine = self.__connect(engine_url())
+        self.__replicas = [self.__connect(url) for url in replica_urls()]
+        # LastWrite - last commit that wrote, shared by the sessions
+        self.__last_write = LastWrite()
+        # dictionary - <class name> -> rows, as of __counted
+        self.__counts = {}
+        self.__counted = None
+        # boolean - whether the next reload() creates the missing tables
+        self.__bootstrap = getenv('HBNB_MYSQL_CREATE_SCHEMA', '1') != '0'
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
+            self.__bootstrap = True
+
+    def __connect(self, url):
+        """returns the engine of url, its pool counted in the pool stats"""
+        url = make_url(url)
+        options = engine_options()
+        if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+            options["poolclass"] = timed_pool(self.__stats)
+        engine = create_engine(url, **options)
+        self.__stats.attach(engine)
+        return engine
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, load=None):
+        """query on the current database session
+
+        load names the relationships to read along with the objects, as a
+        list loaded with "selectin" or as a dictionary of name -> "selectin"
+        or "joined", so that reading them costs one query per relationship
+        instead of one per object. Without a class, each relationship is
+        loaded on the classes that have it.
+        """
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                options = self.__loaders(classes[clss], load,
+                                         strict=cls is not None)
+                if options:
+                    query = query.options(*options)
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    def __loaders(self, cls, load, strict=True):
+        """returns the loader options of the relationships load names
+
+        A name cls has no relationship for is an AttributeError when strict,
+        and is skipped otherwise.
+        """
+        if not load:
+            return []
+        if isinstance(load, str):
+            load = [load]
+        if not isinstance(load, dict):
+            load = dict.fromkeys(load, "selectin")
+        options = []
+        for name, strategy in load.items():
+            if strategy not in loaders:
+                raise ValueError("unknown loading strategy: {}".format(
+                    strategy))
+            if name not in inspect(cls).relationships:
+                if strict:
+                    raise AttributeError("{} has no relationship {}".format(
+                        cls.__name__, name))
+                continue
+            options.append(loaders[strategy](getattr(cls, name)))
+        return options
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
@@ -58,6 +165,86 @@ class DBStorage:
     def save(self):
         """commit all changes of the current database session"""
         self.__session.commit()
+        self.__counted = None
+
+    def bulk_new(self, objs):
+        """adds every object of objs and commits them at once
+
+        The flush sends the rows of each table as a single executemany
+        INSERT. If it fails, the session is rolled back and none of them
+        is added.
+        """
+        try:
+            self.__session.add_all(list(objs))
+            self.save()
+        except Exception:
+            self.__session.rollback()
+            raise
+
+    def bulk_upsert(self, dicts):
+        """creates or updates a row per dictionary, committed at once
+
+        Each dictionary names its class under __class__, as to_dict() does.
+        The row already stored under its id gets its other columns and a
+        new updated_at, otherwise an object is made from it. The existing
+        ids are read from the primary with one query per class and 500
+        ids, the new rows inserted and the others updated as bulk mappings
+        with executemany. Returns the <class name>.id keys, in order.
+
+        Every dictionary is checked and every new object built before the
+        session is changed, so a ValueError naming the first bad dictionary
+        leaves the database unchanged, and a failing write rolls the
+        session back.
+        """
+        dicts = list(dicts)
+        names = [upsert_key(i, value, classes)[0]
+                 for i, value in enumerate(dicts)]
+        existing = {}
+        for name, cls in classes.items():
+            ids = [v["id"] for n, v in zip(names, dicts)
+                   if n == name and v.get("id")]
+            existing[name] = set()
+            for i in range(0, len(ids), 500):
+                existing[name].update(self.__session.execute(
+                    select(cls.id).where(cls.id.in_(ids[i:i + 500])),
+                    bind_arguments={"bind": self.__engine}).scalars())
+        keys = []
+        created = []
+        updates = {}
+        now = datetime.utcnow()
+        for i, (name, value) in enumerate(zip(names, dicts)):
+            cls = classes[name]
+            id = value.get("id")
+            if id in existing[name]:
+                columns = cls.__table__.columns.keys()
+                row = {attr: item for attr, item in value.items()
+                       if attr in columns and attr not in ignored}
+                row["id"] = id
+                row["updated_at"] = now
+                updates.setdefault(name, []).append(row)
+            else:
+                try:
+                    obj = cls(**value)
+                except (TypeError, ValueError) as e:
+                    raise ValueError("item {:d}: {}".format(i, e))
+                created.append(obj)
+                id = obj.id
+                existing[name].add(id)
+            keys.append(name + "." + id)
+        try:
+            self.__session.add_all(created)
+            for name, rows in updates.items():
+                self.__session.execute(update(classes[name]), rows)
+            updated = {(classes[name], row["id"]) for name, rows in
+                       updates.items() for row in rows}
+            for obj in list(self.__session.identity_map.values()):
+                if (type(obj), obj.id) in updated:
+                    self.__session.expire(obj)
+            self.save()
+        except Exception:
+            self.__session.rollback()
+            raise
+        return keys
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
@@ -65,12 +252,46 @@ class DBStorage:
             self.__session.delete(obj)
 
     def reload(self):
-        """reloads data from the database"""
-        Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        """reloads data from the database
+
+        The tables are created by the first reload() of the storage unless
+        HBNB_MYSQL_CREATE_SCHEMA is 0, for databases whose schema is set up
+        beforehand by create_schema() or a migration. The sessions write
+        to the primary database and read from a replica, see RoutingSession,
+        and all share the read-your-writes window of the storage.
+        """
+        if self.__bootstrap:
+            self.create_schema()
+        sess_factory = sessionmaker(class_=RoutingSession,
+                                    primary=self.__engine,
+                                    replicas=self.__replicas,
+                                    window=self.__read_your_writes,
+                                    last_write=self.__last_write,
+                                    expire_on_commit=False)
+        event.listen(sess_factory, "before_flush", self.__check_writable)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def create_schema(self):
+        """creates the tables missing from the database"""
+        Base.metadata.create_all(self.__engine)
+        self.__bootstrap = False
+
+    def begin(self, readonly=False):
+        """starts the session of a unit of work, such as a request
+
+        The session replaces the one of the current thread, which close()
+        ends. A read-only session refuses to flush changes.
+        """
+        self.__session.remove()
+        self.__session.registry.set(self.__session.session_factory(
+            info={"readonly": readonly}))
+
+    def __check_writable(self, session, flush_context, instances):
+        """refuses to flush the changes of a read-only session"""
+        if session.info.get("readonly"):
+            raise RuntimeError("cannot write in a read-only session")
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
@@ -82,9 +303,101 @@ class DBStorage:
             obj = self.__session.query(cls).filter(cls.id == id).first()
         return obj
 
+    def get_many(self, cls, ids):
+        """Returns the objects of cls whose ids are in ids, by id
+
+        The rows are read by primary key with one query per 500 ids.
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        found = {}
+        if cls in classes.values():
+            ids = list({id for id in ids if isinstance(id, str)})
+            for i in range(0, len(ids), 500):
+                for obj in self.__session.query(cls).filter(
+                        cls.id.in_(ids[i:i + 500])):
+                    found[obj.id] = obj
+        return found
+
+    def filter(self, cls, **criteria):
+        """Returns the objects of cls whose attributes equal criteria
+
+        The criteria become the WHERE clause of the query, so only the
+        matching rows are read.
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        new_dict = {}
+        if cls in classes.values():
+            for obj in self.__session.query(cls).filter_by(**criteria):
+                new_dict[obj.__class__.__name__ + '.' + obj.id] = obj
+        return new_dict
+
+    def page(self, cls, limit=None, after=None, **criteria):
+        """Returns up to limit objects of cls in id order, from the first
+        id after `after`
+
+        The rows are read in primary key order, so the database seeks to
+        `after` in the index of the ids instead of skipping rows as an
+        OFFSET does.
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return []
+        query = self.__session.query(cls).filter_by(**criteria)
+        if after is not None:
+            query = query.filter(cls.id > after)
+        query = query.order_by(cls.id)
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    def listing(self, cls, attr=None, value=None):
+        """Returns None, there are no columnar snapshots in db mode"""
+        return None
+
+    def pool_stats(self):
+        """Returns the checkout and wait metrics of the connection pools
+
+        The counters add up the pools of every database, the occupancy is
+        that of the primary.
+        """
+        return self.__stats.to_dict(self.__engine.pool)
+
     def count(self, cls=None):
         """Returns the number of objects in storage"""
+        if cls is None:
+            names = list(classes)
+        else:
+            name = cls if isinstance(cls, str) else getattr(cls, "__name__",
+                                                            None)
+            if name not in classes:
+                return 0
+            names = [name]
         try:
-            return len(self.all(cls))
+            counts = self.__table_counts(names)
         except Exception:
             return None
+        return sum(counts[name] for name in names)
+
+    def __table_counts(self, names):
+        """returns the rows of the tables of names, by class name
+
+        With HBNB_COUNT_TTL set, every table is counted at once and the
+        result reused for that many seconds, or until the next save.
+        """
+        if self.__count_ttl <= 0:
+            return self.__select_counts(names)
+        now = time.monotonic()
+        if self.__counted is None or now - self.__counted >= self.__count_ttl:
+            self.__counts = self.__select_counts(list(classes))
+            self.__counted = now
+        return self.__counts
+
+    def __select_counts(self, names):
+        """returns the rows of the tables of names from a single SELECT"""
+        query = select(*[select(func.count()).select_from(
+            classes[name].__table__).scalar_subquery().label(name)
+            for name in names])
+        return dict(zip(names, self.__session.execute(query).one()))
@@ -3,7 +3,15 @@
 Contains the FileStorage class
 """
 
+import bisect
+from datetime import datetime
+from contextlib import contextmanager
 import json
+import logging
+from models.engine import columnar, ignored, snapshot, upsert_key
+from models.engine.codec import codecs, sniff
+from models.engine.compact import compact_class
+from models.engine.group_commit import GroupCommit
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -11,9 +19,20 @@ from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+import os
+import sys
+import threading
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+log = logging.getLogger(__name__)
+foreign_keys = {"Amenity": ["place_id"], "City": ["state_id"],
+                "Place": ["city_id", "user_id"],
+                "Review": ["place_id", "user_id"]}
 
 
 class FileStorage:
@@ -23,61 +42,734 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - <class name> -> {<class name>.id: obj}, kept with __objects
+    __classes = {}
+    # dictionary - (<class name>, <attribute>) -> {value: {key: obj}}
+    __relations = {}
+    # dictionary - <class name>.id -> {<attribute>: indexed value}
+    __references = {}
+    # dictionary - <class name>.id -> obj, or None once deleted, since save
+    __changes = {}
+    # dictionary - <class name>.id -> (obj, codec, its entry at the save)
+    __fragments = {}
+    # dictionary - <class name> -> sorted ids of its objects, once paged
+    __order = {}
+    # dictionary - (<class name>, <attribute>) -> {value: sorted ids of the
+    # objects in __relations under it}, once paged
+    __relation_order = {}
+    # boolean - append changes to <__file_path>.journal instead of rewriting
+    __journal = os.getenv("HBNB_FILE_JOURNAL") == "1"
+    # integer - journal records that trigger a compaction into the snapshot
+    __journal_limit = int(os.getenv("HBNB_FILE_JOURNAL_LIMIT", "1000"))
+    # integer - records currently in the journal
+    __journal_size = 0
+    # lock - serializes mutations with the writes of the JSON file
+    __lock = threading.RLock()
+    # integer - previous snapshots kept as <__file_path>.1, .2, ...
+    __backups = int(os.getenv("HBNB_FILE_BACKUPS", "0"))
+    # integer - milliseconds a group commit waits for more saves, 0 is off
+    __commit_ms = int(os.getenv("HBNB_FILE_GROUP_COMMIT_MS", "0"))
+    # integer - saves that flush a group commit without waiting
+    __commit_size = int(os.getenv("HBNB_FILE_GROUP_COMMIT_SIZE", "64"))
+    # GroupCommit - shared writer once group commit is used
+    __committer = None
+    # boolean - keep loaded entries as dicts until they are first accessed
+    __lazy = os.getenv("HBNB_FILE_LAZY") == "1"
+    # dictionary - <class name> -> {<class name>.id: entry not built}
+    __raw = {}
+    # codec - format of the entries in __raw
+    __raw_codec = codecs["json"]
+    # boolean - build loaded objects from the slot based compact classes
+    __compact = os.getenv("HBNB_FILE_COMPACT") == "1"
+    # codec - format the snapshot is written in, "json" or "binary"
+    __codec = codecs[os.getenv("HBNB_FILE_CODEC", "json")]
+    # string - directory of the columnar snapshots served by listing()
+    __columnar_dir = os.getenv("HBNB_COLUMNAR_DIR")
+    # dictionary - <class name> -> its mapped columnar snapshot
+    __tables = {}
+    # boolean - other processes read and write the same JSON file
+    __shared = os.getenv("HBNB_FILE_SHARED") == "1"
+    # bytes - version of the JSON file as last read or written
+    __version = None
+    # bytes - snapshot.signature() of the JSON file as last read or written
+    __signature = None
+    # integer - bytes of the journal applied to the objects
+    __journal_offset = 0
+    # string - what close() does: "always" reload, reload if "changed" by
+    # another process or "never"
+    __refresh_policy = os.getenv("HBNB_FILE_REFRESH", "changed")
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def all(self, cls=None, load=None):
+        """returns the dictionary __objects
+
+        load is accepted for DBStorage compatibility and ignored, related
+        objects are read from memory.
+        """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            with self.__lock:
+                self.__hydrate(cls)
+                return dict(self.__bucket(cls))
+        if self.__raw:
+            with self.__lock:
+                for name in list(self.__raw):
+                    self.__hydrate(name)
         return self.__objects
 
+    def __hydrate(self, cls, key=None):
+        """builds the loaded entries of cls, or only the one under key"""
+        name = cls if isinstance(cls, str) else getattr(cls, "__name__", None)
+        raw = self.__raw.get(name)
+        if not raw:
+            return
+        if key is None:
+            del self.__raw[name]
+            for key, entry in raw.items():
+                self.__put(key, self.__build(
+                    name, self.__raw_codec.decode(entry)))
+        elif key in raw:
+            self.__put(key, self.__build(
+                name, self.__raw_codec.decode(self.__unraw(key))))
+
+    def __build(self, name, value):
+        """returns the instance of the class called name described by value"""
+        for attr in ["id"] + foreign_keys.get(name, []):
+            if type(value.get(attr)) is str:
+                value[attr] = sys.intern(value[attr])
+        if self.__compact:
+            return compact_class(classes[name])(**value)
+        if type(value.get("created_at")) is datetime and \
+                type(value.get("updated_at")) is datetime and "id" in value:
+            # decoded attributes need no parsing, nor change tracking yet
+            del value["__class__"]
+            obj = classes[name].__new__(classes[name])
+            obj.__dict__.update(value)
+            return obj
+        return classes[name](**value)
+
+    def __unraw(self, key):
+        """removes and returns the loaded entry under key, if any"""
+        name = key.split(".", 1)[0]
+        raw = self.__raw.get(name)
+        if not raw or key not in raw:
+            return None
+        value = raw.pop(key)
+        if not raw:
+            del self.__raw[name]
+        return value
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            for attr in ["id"] + foreign_keys.get(obj.__class__.__name__, []):
+                value = getattr(obj, attr, None)
+                if type(value) is str and value:
+                    # bypasses __setattr__, the value itself is unchanged
+                    object.__setattr__(obj, attr, sys.intern(value))
+            with self.__lock:
+                self.__unraw(key)
+                self.__put(key, obj)
+                self.__changes[key] = obj
+
+    def changed(self, obj):
+        """flags a stored obj as dirty after one of its attributes is set"""
+        key = obj.__class__.__name__ + "." + obj.id
+        if self.__objects.get(key) is obj:
+            with self.__lock:
+                self.__changes[key] = obj
+                if key in self.__references:
+                    self.__relink(key, obj)
+
+    def __put(self, key, obj):
+        """stores obj in __objects under key and indexes it"""
+        key = sys.intern(key)
+        old = self.__objects.get(key)
+        if old is not None:
+            self.__unindex(key, old)
+        self.__objects[key] = obj
+        self.__index(key, obj)
+        self.__ordered(key, True)
+
+    def __index(self, key, obj):
+        """adds obj to the per-class map and the foreign key indexes"""
+        name = obj.__class__.__name__
+        if name not in self.__classes:
+            self.__classes[name] = {}
+        self.__classes[name][key] = obj
+        self.__link(key, obj)
+
+    def __link(self, key, obj):
+        """adds obj to the indexes of its foreign key attributes"""
+        name = obj.__class__.__name__
+        if name not in foreign_keys:
+            return
+        refs = {}
+        for attr in foreign_keys[name]:
+            value = getattr(obj, attr, None)
+            if not value:
+                continue
+            index = self.__relations.setdefault((name, attr), {})
+            index.setdefault(value, {})[key] = obj
+            refs[attr] = value
+            ids = self.__relation_order.get((name, attr), {}).get(value)
+            if ids is not None:
+                self.__place(ids, key.split(".", 1)[1], True)
+        self.__references[key] = refs
+
+    def __unlink(self, key, obj):
+        """removes obj from the indexes of its foreign key attributes"""
+        name = obj.__class__.__name__
+        for attr, value in self.__references.pop(key, {}).items():
+            index = self.__relations.get((name, attr), {})
+            children = index.get(value)
+            if children is not None:
+                children.pop(key, None)
+                if not children:
+                    del index[value]
+            order = self.__relation_order.get((name, attr), {})
+            if value in order:
+                self.__place(order[value], key.split(".", 1)[1], False)
+                if not order[value]:
+                    del order[value]
+
+    def __relink(self, key, obj):
+        """refreshes the foreign key indexes if obj's attributes changed"""
+        refs = self.__references.get(key)
+        if refs is None:
+            return
+        for attr in foreign_keys[obj.__class__.__name__]:
+            if refs.get(attr) != (getattr(obj, attr, None) or None):
+                self.__unlink(key, obj)
+                self.__link(key, obj)
+                return
+
+    def __bucket(self, cls):
+        """returns the per-class map for a class or a class name"""
+        name = cls if isinstance(cls, str) else getattr(cls, "__name__", None)
+        return self.__classes.get(name, {})
+
+    def __ordered(self, key, present):
+        """adds or removes the id of key in its class's sorted ids, if any"""
+        name, id = key.split(".", 1)
+        ids = self.__order.get(name)
+        if ids is not None:
+            self.__place(ids, id, present)
+
+    def __place(self, ids, id, present):
+        """inserts or removes id in the sorted list ids"""
+        i = bisect.bisect_left(ids, id)
+        found = i < len(ids) and ids[i] == id
+        if present and not found:
+            ids.insert(i, id)
+        elif not present and found:
+            del ids[i]
+
+    def __unindex(self, key, obj):
+        """removes obj from the per-class map"""
+        bucket = self.__classes.get(obj.__class__.__name__)
+        if bucket is not None:
+            bucket.pop(key, None)
+        self.__unlink(key, obj)
+        self.__fragments.pop(key, None)
 
     def save(self):
         """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        if self.__commit_ms <= 0:
+            self.__flush()
+            return
+        if self.__committer is None:
+            with self.__lock:
+                if self.__committer is None:
+                    FileStorage.__committer = GroupCommit(
+                        self.__flush, self.__commit_ms / 1000.0,
+                        self.__commit_size)
+        self.__committer.commit()
+
+    def bulk_new(self, objs):
+        """adds every object of objs and saves them with a single write
+
+        Raises ValueError, storing none of them, if one has no string id.
+        """
+        objs = list(objs)
+        for i, obj in enumerate(objs):
+            if not isinstance(getattr(obj, "id", None), str):
+                raise ValueError("item {:d}: invalid id".format(i))
+        with self.__lock:
+            for obj in objs:
+                self.new(obj)
+        self.save()
+
+    def bulk_upsert(self, dicts):
+        """creates or updates an object per dictionary, saved at once
+
+        Each dictionary names its class under __class__, as to_dict() does.
+        The object already stored under its id gets its other attributes
+        and a new updated_at, otherwise an object is made from it. Returns
+        the <class name>.id keys of the objects, in order.
+
+        Every dictionary is checked and every new object built before any
+        is stored, so a ValueError naming the first bad dictionary leaves
+        the storage unchanged.
+        """
+        keys = []
+        created = {}
+        updates = []
+        now = datetime.utcnow()
+        with self.__lock:
+            for i, value in enumerate(dicts):
+                name, id = upsert_key(i, value, classes)
+                key = None if id is None else name + "." + id
+                obj = created.get(key) or self.get(name, id)
+                if obj is None:
+                    try:
+                        obj = classes[name](**value)
+                    except (TypeError, ValueError) as e:
+                        raise ValueError("item {:d}: {}".format(i, e))
+                    key = name + "." + obj.id
+                    created[key] = obj
+                else:
+                    updates.append((obj, value))
+                keys.append(key)
+            for obj in created.values():
+                self.new(obj)
+            for obj, value in updates:
+                for attr, item in value.items():
+                    if attr not in ignored:
+                        setattr(obj, attr, item)
+                obj.updated_at = now
+        self.save()
+        return keys
+
+    def __flush(self):
+        """writes the pending changes to the journal or the JSON file
+
+        In shared mode the changes are first applied on top of what other
+        processes wrote since the file was last read.
+        """
+        with self.__lock, self.__locked(True) as fd:
+            if fd is not None and self.__current(fd) != self.__version:
+                self.__refresh(fd)
+            if self.__journal:
+                self.__append()
+            else:
+                self.__dump()
+            if fd is not None:
+                generation = int(os.pread(fd, 20, 0) or b"0") + 1
+                os.pwrite(fd, b"%020d" % generation, 0)
+            FileStorage.__version = self.__current(fd)
+
+    @contextmanager
+    def __locked(self, exclusive):
+        """holds the lock file of the JSON file in shared mode
+
+        Writers hold it exclusively and readers shared, so a reader never
+        sees a journal being appended to. Yields the descriptor of the
+        lock file, or None outside of shared mode.
+        """
+        if not self.__shared:
+            yield None
+            return
+        if fcntl is None:
+            raise OSError("HBNB_FILE_SHARED needs fcntl file locks")
+        fd = os.open(self.__file_path + ".lock", os.O_RDWR | os.O_CREAT,
+                     0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield fd
+        finally:
+            os.close(fd)
+
+    def __current(self, fd):
+        """returns the version of the JSON file
+
+        In shared mode, fd is the lock file and the version starts with the
+        generation writers bump in it, which changes even when two writes
+        get the same mtime. The stat of the files also catches writes from
+        processes outside shared mode.
+        """
+        version = snapshot.version(self.__file_path)
+        if fd is None:
+            return version
+        return os.pread(fd, 20, 0) + b";" + version
+
+    def __dump(self, path=None, codec=None):
+        """writes every object to the JSON file, reusing clean fragments
+
+        With path, the objects are exported there in the format of codec
+        and the pending changes are left for the next save.
+        """
+        codec = codec or self.__codec
+        parts = []
+        for key, obj in self.__objects.items():
+            cached = self.__fragments.get(key)
+            if cached is None or cached[0] is not obj or \
+                    cached[1] is not codec or key in self.__changes:
+                fragment = codec.encode(key, obj)
+                self.__fragments[key] = (obj, codec, fragment)
+            else:
+                fragment = cached[2]
+            parts.append(fragment)
+        for raw in self.__raw.values():
+            for key, entry in raw.items():
+                if self.__raw_codec is codec:
+                    parts.append(codec.part(key, entry))
+                else:
+                    parts.append(codec.convert(
+                        key, self.__raw_codec.decode(entry)))
+        if path is not None:
+            snapshot.write(path, codec.join(parts))
+            return
+        snapshot.write(self.__file_path, codec.join(parts), self.__backups)
+        FileStorage.__signature = snapshot.signature(self.__file_path)
+        self.__changes.clear()
+
+    def __append(self):
+        """appends the changes since the last save to the journal"""
+        if not self.__changes:
+            return
+        with open(self.__file_path + ".journal", 'a') as f:
+            for key, obj in self.__changes.items():
+                if obj is None:
+                    f.write(json.dumps([key, None]) + "\n")
+                else:
+                    f.write(json.dumps([key, obj.to_dict()]) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+            FileStorage.__journal_offset = f.tell()
+        FileStorage.__journal_size += len(self.__changes)
+        self.__changes.clear()
+        if self.__journal_size >= self.__journal_limit:
+            self.compact()
+
+    def compact(self):
+        """folds the journal into a fresh snapshot of the JSON file"""
+        with self.__lock:
+            self.__dump()
+            with open(self.__file_path + ".journal", 'w'):
+                pass
+            FileStorage.__journal_size = 0
+            FileStorage.__journal_offset = 0
 
     def reload(self):
         """deserializes the JSON file to __objects"""
+        with self.__lock, self.__locked(False) as fd:
+            FileStorage.__version = self.__current(fd)
+            self.__read()
+
+    def refresh(self):
+        """replaces __objects with the JSON file if another process wrote it
+
+        Objects deleted by the other process are dropped, and the changes
+        not saved yet are kept on top of what was read.
+        """
+        with self.__lock, self.__locked(False) as fd:
+            if self.__current(fd) != self.__version:
+                self.__refresh(fd)
+
+    def __refresh(self, fd):
+        """reads the JSON file anew, keeping the unsaved changes
+
+        When only records were appended to the journal since it was last
+        read, just those records are applied.
+        """
+        pending = dict(self.__changes)
+        FileStorage.__version = self.__current(fd)
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception:
+            grown = os.path.getsize(self.__file_path + ".journal") >= \
+                self.__journal_offset
+        except OSError:
+            grown = False
+        if self.__journal and grown and \
+                snapshot.signature(self.__file_path) == self.__signature:
+            self.__replay(self.__journal_offset)
+        else:
+            for attr in (self.__objects, self.__classes, self.__relations,
+                         self.__references, self.__changes,
+                         self.__fragments, self.__raw, self.__order,
+                         self.__relation_order):
+                attr.clear()
+            self.__read()
+        for key, obj in pending.items():
+            if obj is None:
+                self.__discard(key)
+            else:
+                self.__unraw(key)
+                self.__put(key, obj)
+        self.__changes.update(pending)
+
+    def __read(self):
+        """loads the newest readable snapshot and replays the journal
+
+        A snapshot is parsed whole before any of its objects is stored, so
+        one that turns out truncated or corrupt leaves nothing behind when
+        the next one is tried.
+        """
+        FileStorage.__signature = snapshot.signature(self.__file_path)
+        for path in snapshot.candidates(self.__file_path, self.__backups):
+            entries, codec = {}, self.__raw_codec
+            try:
+                with open(path, 'rb') as f:
+                    codec, stream = sniff(f)
+                    for key, value in codec.iter(stream, self.__lazy):
+                        entries[key] = value
+            except FileNotFoundError:
+                if path == self.__file_path:
+                    break
+                continue
+            except ValueError:
+                log.warning("skipping unreadable snapshot %s after %d "
+                            "objects", path, len(entries))
+                continue
+            except Exception:
+                log.exception("stopped loading snapshot %s", path)
+            if self.__raw and codec is not self.__raw_codec:
+                self.all()
+            FileStorage.__raw_codec = codec
+            loaded = 0
+            try:
+                for key, value in entries.items():
+                    self.__load(key, value)
+                    loaded += 1
+            except Exception:
+                log.exception("stopped loading snapshot %s", path)
+            if path != self.__file_path:
+                log.warning("recovered %d objects from snapshot %s",
+                            loaded, path)
+            break
+        if self.__journal:
+            self.__replay()
+
+    def __load(self, key, value):
+        """builds and stores the object read as value under key
+
+        In lazy mode value may be the entry as written by the snapshot codec,
+        which is kept as is until the object is first accessed.
+        """
+        self.__changes.pop(key, None)
+        if not isinstance(value, dict):
+            name = key.split(".", 1)[0]
+            if name not in classes:
+                raise KeyError(name)
+            self.__discard(key)
+            self.__raw.setdefault(name, {})[sys.intern(key)] = value
+            self.__ordered(key, True)
+        else:
+            self.__unraw(key)
+            self.__put(key, self.__build(value["__class__"], value))
+
+    def export(self, path, codec="json"):
+        """writes every object to path in the format named codec"""
+        with self.__lock:
+            self.__dump(path, codecs[codec])
+
+    def load(self, path):
+        """adds the objects of the snapshot at path, in either format
+
+        They are written to the JSON file, in its own format, on the next
+        save.
+        """
+        with self.__lock:
+            with open(path, 'rb') as f:
+                codec, stream = sniff(f)
+                for key, value in codec.iter(stream):
+                    self.__load(key, value)
+                    self.__changes[key] = self.__objects[key]
+
+    def __discard(self, key):
+        """forgets key whether it was built or not"""
+        if key in self.__objects:
+            self.__unindex(key, self.__objects.pop(key))
+        self.__unraw(key)
+        self.__ordered(key, False)
+
+    def __replay(self, offset=0):
+        """applies the journal records from offset on top of the objects"""
+        if offset == 0:
+            FileStorage.__journal_size = 0
+        path = self.__file_path + ".journal"
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("incomplete record")
+                        key, value = json.loads(line)
+                    except ValueError:
+                        # a torn tail from an interrupted append is dropped
+                        os.truncate(path, offset)
+                        break
+                    if value is not None:
+                        self.__load(key, value)
+                    else:
+                        self.__discard(key)
+                    offset += len(line)
+                    FileStorage.__journal_size += 1
+        except FileNotFoundError:
             pass
+        FileStorage.__journal_offset = offset
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__lock:
+                if key in self.__objects:
+                    self.__unindex(key, self.__objects.pop(key))
+                    self.__ordered(key, False)
+                    self.__changes[key] = None
+
+    def begin(self, readonly=False):
+        """does nothing, the objects are shared by every unit of work"""
+        pass
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """reads the JSON file again as set by HBNB_FILE_REFRESH
+
+        "changed", the default, only reads it if another process wrote it,
+        see refresh(). "always" calls reload() every time, outside shared
+        mode, and "never" keeps the objects as they are.
+        """
+        if self.__refresh_policy == "never":
+            return
+        if self.__refresh_policy == "always" and not self.__shared:
+            self.reload()
+        else:
+            self.refresh()
 
     def get(self, cls, id):
         """Returns an object based on its ID"""
-        if cls:
-            result = list(filter(lambda x: type(x) is cls and x.id == id,
-                                 self.__objects.values()))
-            if result:
-                return result[0]
+        if cls and isinstance(id, str):
+            name = cls if isinstance(cls, str) else cls.__name__
+            key = name + "." + id
+            if key not in self.__objects and key in self.__raw.get(name, {}):
+                with self.__lock:
+                    self.__hydrate(name, key)
+            return self.__objects.get(key)
         return None
 
+    def get_many(self, cls, ids):
+        """Returns the objects of cls whose ids are in ids, by id"""
+        found = {}
+        for id in ids:
+            obj = self.get(cls, id)
+            if obj is not None:
+                found[id] = obj
+        return found
+
+    def filter(self, cls, **criteria):
+        """Returns the objects of cls whose attributes equal criteria
+
+        An id or foreign key criterion is looked up in the indexes, and only
+        the objects it selects are compared with the other criteria.
+        """
+        name = cls if isinstance(cls, str) else getattr(cls, "__name__", None)
+        with self.__lock:
+            if "id" in criteria:
+                obj = self.get(name, criteria["id"])
+                found = {} if obj is None else {name + "." + obj.id: obj}
+            else:
+                self.__hydrate(name)
+                found = self.__bucket(name)
+                for attr in foreign_keys.get(name, []):
+                    if attr in criteria:
+                        found = self.__relations.get((name, attr), {}).get(
+                            criteria[attr], {})
+                        break
+            return {key: obj for key, obj in found.items()
+                    if all(getattr(obj, attr, None) == value
+                           for attr, value in criteria.items())}
+
+    def page(self, cls, limit=None, after=None, **criteria):
+        """Returns up to limit objects of cls in id order, from the first
+        id after `after`
+
+        The ids of a class are sorted when it is first paged through and
+        kept sorted as objects come and go, so a page costs a binary
+        search and the objects it holds. With criteria, as filter() takes
+        them, the objects read are those of the sorted ids kept the same
+        way for the value of a foreign key criterion, or else for the
+        class, and the objects not matching the criteria are skipped.
+        """
+        name = cls if isinstance(cls, str) else getattr(cls, "__name__", None)
+        if name not in classes:
+            return []
+        with self.__lock:
+            attr = next((attr for attr in foreign_keys.get(name, [])
+                         if attr in criteria), None)
+            if "id" in criteria:
+                ids = sorted(key.split(".", 1)[1]
+                             for key in self.filter(name, **criteria))
+            elif attr is not None:
+                self.__hydrate(name)
+                value = criteria[attr]
+                order = self.__relation_order.setdefault((name, attr), {})
+                ids = order.get(value)
+                if ids is None:
+                    ids = sorted(key.split(".", 1)[1] for key in
+                                 self.__relations.get((name, attr), {}).get(
+                                     value, {}))
+                    if ids:
+                        order[value] = ids
+            else:
+                ids = self.__order.get(name)
+                if ids is None:
+                    ids = sorted(key.split(".", 1)[1] for key in
+                                 list(self.__bucket(name)) +
+                                 list(self.__raw.get(name, {})))
+                    self.__order[name] = ids
+            i = 0 if after is None else bisect.bisect_right(ids, after)
+            objs = []
+            while i < len(ids) and (not limit or len(objs) < limit):
+                obj = self.get(name, ids[i])
+                if obj is not None and all(
+                        getattr(obj, attr, None) == value
+                        for attr, value in criteria.items()):
+                    objs.append(obj)
+                i += 1
+            return objs
+
+    def listing(self, cls, attr=None, value=None):
+        """Returns the JSON array of the objects of cls, or of those whose
+        attr equals value, read from the class's columnar snapshot
+
+        Returns None when HBNB_COLUMNAR_DIR is not set, when attr is not
+        the attribute the snapshot is sorted on, while changes are not
+        saved yet, or when another process wrote the JSON file since the
+        objects were read, for the caller to serialize the objects instead.
+        The snapshot is stamped with the version the objects were read or
+        saved at, and rebuilt from them when its stamp is another one.
+        """
+        name = cls if isinstance(cls, str) else getattr(cls, "__name__", None)
+        if not self.__columnar_dir or name not in classes or self.__changes:
+            return None
+        sort = foreign_keys.get(name, [None])[0]
+        if attr is not None and attr != sort:
+            return None
+        path = os.path.join(self.__columnar_dir, name + ".col")
+        with self.__lock, self.__locked(False) as fd:
+            source = self.__version
+            if source is None or self.__current(fd) != source:
+                return None
+            table = self.__tables.get(name)
+            if table is None or table.token != source:
+                table = self.__table(path)
+            if table is None or table.token != source:
+                columnar.write(path, self.all(name).values(), source, sort)
+                table = self.__table(path)
+            self.__tables[name] = table
+        return table.rows(value)
+
+    def __table(self, path):
+        """maps the columnar snapshot at path, None if it is unreadable"""
+        try:
+            return columnar.Columnar(path)
+        except (OSError, ValueError):
+            return None
+
     def count(self, cls=None):
         """Returns the number of objects in storage"""
-        return len(self.all(cls))
+        if cls is None:
+            return len(self.__objects) + sum(map(len, self.__raw.values()))
+        name = cls if isinstance(cls, str) else getattr(cls, "__name__", None)
+        return len(self.__bucket(name)) + len(self.__raw.get(name, {}))
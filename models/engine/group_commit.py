@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Contains the GroupCommit class
+"""
+
+import threading
+import time
+
+
+class GroupCommit:
+    """coalesces concurrent commits into batched calls to a flush function"""
+
+    def __init__(self, flush, interval=0.005, size=64):
+        """Instantiate a GroupCommit around flush
+
+        interval is the longest a batch waits for more commits, in seconds,
+        and size the number of commits that flushes a batch right away.
+        """
+        self.__flush = flush
+        self.__interval = interval
+        self.__size = size
+        self.__cond = threading.Condition()
+        # integer - number of the batch that commits currently join
+        self.__open = 1
+        # integer - number of the last batch written by flush
+        self.__flushed = 0
+        # integer - commits waiting in the open batch
+        self.__pending = 0
+        # dictionary - batch number -> [exception, waiters left to raise it]
+        self.__failed = {}
+        self.__writer = None
+
+    def commit(self):
+        """blocks until a flush that includes this commit has completed"""
+        with self.__cond:
+            batch = self.__open
+            self.__pending += 1
+            if self.__writer is None or not self.__writer.is_alive():
+                self.__writer = threading.Thread(target=self.__run,
+                                                 daemon=True)
+                self.__writer.start()
+            self.__cond.notify_all()
+            while self.__flushed < batch:
+                self.__cond.wait()
+            failure = self.__failed.get(batch)
+            if failure is not None:
+                failure[1] -= 1
+                if failure[1] == 0:
+                    del self.__failed[batch]
+                raise failure[0]
+
+    def __run(self):
+        """writer loop flushing one batch of commits at a time"""
+        while True:
+            with self.__cond:
+                while self.__pending == 0:
+                    self.__cond.wait()
+                deadline = time.monotonic() + self.__interval
+                while self.__pending < self.__size:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        break
+                    self.__cond.wait(left)
+                batch = self.__open
+                waiters = self.__pending
+                self.__open += 1
+                self.__pending = 0
+            try:
+                self.__flush()
+                failure = None
+            except Exception as e:
+                failure = e
+            with self.__cond:
+                if failure is not None:
+                    self.__failed[batch] = [failure, waiters]
+                self.__flushed = batch
+                self.__cond.notify_all()
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Contains the connection pool metrics of DBStorage
+"""
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+import threading
+import time
+
+
+class PoolStats:
+    """counts what a connection pool hands out and how long callers wait"""
+
+    def __init__(self):
+        """Instantiate empty counters"""
+        self.__lock = threading.Lock()
+        self.__counts = dict.fromkeys(["connects", "checkouts", "checkins",
+                                       "invalidations", "timeouts",
+                                       "waits"], 0)
+        self.__wait_total = 0.0
+        self.__wait_max = 0.0
+
+    def add(self, name, n=1):
+        """adds n to the counter called name"""
+        with self.__lock:
+            self.__counts[name] += n
+
+    def waited(self, seconds):
+        """records a checkout that waited seconds for a connection"""
+        with self.__lock:
+            self.__counts["waits"] += 1
+            self.__wait_total += seconds
+            self.__wait_max = max(self.__wait_max, seconds)
+
+    def attach(self, engine):
+        """counts the connection events of the pool of engine"""
+        for name, counter in [("connect", "connects"),
+                              ("checkout", "checkouts"),
+                              ("checkin", "checkins"),
+                              ("invalidate", "invalidations")]:
+            event.listen(engine, name, self.__listener(counter))
+
+    def __listener(self, counter):
+        """returns a pool event listener incrementing counter"""
+        def listener(*args):
+            """counts one pool event"""
+            self.add(counter)
+        return listener
+
+    def to_dict(self, pool=None):
+        """returns the counters, and the occupancy of pool if given"""
+        with self.__lock:
+            stats = dict(self.__counts)
+            stats["wait_total"] = self.__wait_total
+            stats["wait_max"] = self.__wait_max
+        if isinstance(pool, QueuePool):
+            stats["size"] = pool.size()
+            stats["checked_out"] = pool.checkedout()
+            stats["overflow"] = pool.overflow()
+        return stats
+
+
+def timed_pool(stats):
+    """returns a QueuePool class recording its checkout waits in stats"""
+    class TimedQueuePool(QueuePool):
+        """QueuePool timing how long each checkout waits for a connection
+
+        The time includes opening a new connection when the pool has none
+        idle but may still overflow.
+        """
+
+        def _do_get(self):
+            """returns a pooled connection, timing the wait for it"""
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                stats.add("timeouts")
+                raise
+            finally:
+                stats.waited(time.perf_counter() - start)
+
+    return TimedQueuePool
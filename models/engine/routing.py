@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Contains the session routing DBStorage reads to replicas
+"""
+
+import random
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+import time
+
+
+class LastWrite:
+    """time of the last commit that wrote, shared by sessions so that the
+    read-your-writes window outlives the session that wrote"""
+
+    def __init__(self):
+        """Instantiate a time never written"""
+        self.time = None
+
+
+class RoutingSession(Session):
+    """session writing to a primary engine and reading from its replicas
+
+    A session reads from one replica, picked at random when it first
+    reads. Once its transaction writes, it reads from the primary until
+    that transaction ends, so it sees its own uncommitted rows, and keeps
+    reading from it for window seconds after committing the writes, so
+    it sees them before the replicas catch up. The sessions given the
+    same last_write share that window.
+    """
+
+    def __init__(self, primary=None, replicas=(), window=0, last_write=None,
+                 **kwargs):
+        """Instantiate a session over primary and the replicas engines"""
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.window = window
+        self.last_write = LastWrite() if last_write is None else last_write
+        self.__replica = None
+        self.__writing = False
+        event.listen(self, "after_commit", self.__committed)
+        event.listen(self, "after_transaction_end", self.__ended)
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """returns the engine a statement or a flush runs on"""
+        if not self.replicas:
+            return self.primary
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.__writing = True
+        if self.__writing or self.recently_written():
+            return self.primary
+        if self.__replica is None:
+            self.__replica = random.choice(self.replicas)
+        return self.__replica
+
+    def recently_written(self):
+        """returns True if the session committed writes within window"""
+        wrote = self.last_write.time
+        return wrote is not None and time.monotonic() - wrote < self.window
+
+    def __committed(self, session):
+        """starts the read-your-writes window of a transaction that wrote"""
+        if self.__writing:
+            self.last_write.time = time.monotonic()
+            self.__writing = False
+
+    def __ended(self, session, transaction):
+        """forgets the writes of the outermost transaction once it ends"""
+        if transaction.parent is None:
+            self.__writing = False
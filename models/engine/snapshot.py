@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+"""
+Contains the helpers that write and locate FileStorage snapshots
+"""
+
+import json
+import os
+import shutil
+
+decoder = json.JSONDecoder()
+whitespace = " \t\n\r"
+
+
+def backup_path(path, n):
+    """returns the path of the n-th previous snapshot of path"""
+    return "{}.{:d}".format(path, n)
+
+
+def candidates(path, backups=0):
+    """returns path followed by its previous snapshots, newest first"""
+    return [path] + [backup_path(path, n) for n in range(1, backups + 1)]
+
+
+def fsync_dir(path):
+    """flushes the directory entry of path to disk"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def rotate(path, backups):
+    """shifts the previous snapshots of path and keeps path as the first"""
+    if backups <= 0 or not os.path.exists(path):
+        return
+    for n in range(backups - 1, 0, -1):
+        if os.path.exists(backup_path(path, n)):
+            os.replace(backup_path(path, n), backup_path(path, n + 1))
+    first = backup_path(path, 1)
+    if os.path.exists(first):
+        os.remove(first)
+    try:
+        os.link(path, first)
+    except OSError:
+        shutil.copy2(path, first)
+
+
+def signature(path):
+    """returns the inode, mtime and size of path, b"-" if it is missing"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return b"-"
+    return "{:d}:{:d}:{:d}".format(st.st_ino, st.st_mtime_ns,
+                                   st.st_size).encode("utf-8")
+
+
+def version(path):
+    """returns what identifies the current content of the JSON file path
+
+    It changes whenever the file is replaced or its journal appended to,
+    which tells readers that their copy of the objects is stale.
+    """
+    return signature(path) + b";" + signature(path + ".journal")
+
+
+def write(path, text, backups=0):
+    """atomically replaces path with text, keeping backups older copies
+
+    The text goes to a temporary file in the same directory which is
+    fsynced and renamed over path, so path is always either the old or
+    the new snapshot, never a truncated one. text may also be bytes.
+    """
+    tmp = "{}.tmp{:d}".format(path, os.getpid())
+    try:
+        with open(tmp, 'wb' if isinstance(text, bytes) else 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        rotate(path, backups)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    fsync_dir(path)
+
+
+def iter_json(f, size=65536, raw=False):
+    """yields the (key, value) pairs of the JSON object in f one by one
+
+    Only the entry being decoded and one read buffer are held in memory,
+    instead of the whole parsed document. With raw, each value is yielded
+    as its JSON text instead of being decoded.
+    """
+    buf = f.read(size)
+    pos = 0
+    eof = not buf
+    first = True
+
+    def fill():
+        """reads more of f, dropping the part of buf already decoded"""
+        nonlocal buf, pos, eof
+        more = f.read(max(size, len(buf) - pos))
+        buf = buf[pos:] + more
+        pos = 0
+        eof = not more
+
+    def token():
+        """returns the next non whitespace character without consuming it"""
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in whitespace:
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            fill()
+
+    def value(text=False):
+        """decodes the JSON value starting at pos, or returns its text"""
+        nonlocal pos
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                if end < len(buf) or eof:
+                    if text:
+                        item = buf[pos:end]
+                    pos = end
+                    return item
+            except ValueError:
+                if eof:
+                    raise
+            fill()
+
+    if token() != "{":
+        raise ValueError("snapshot is not a JSON object")
+    pos += 1
+    while True:
+        char = token()
+        if char == "}":
+            return
+        if not first:
+            if char != ",":
+                raise ValueError("expected ',' at offset {:d}".format(pos))
+            pos += 1
+            token()
+        first = False
+        key = value()
+        if token() != ":":
+            raise ValueError("expected ':' at offset {:d}".format(pos))
+        pos += 1
+        token()
+        yield key, value(raw)
@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatchDocs and TestBatch classes
+"""
+
+import inspect
+from api.v1.app import app
+import importlib
+from models import storage
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+batch = importlib.import_module("api.v1.views.batch")
+
+
+class TestBatchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the batch view"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.batch_f = inspect.getmembers(batch, inspect.isfunction)
+        cls.batch_f = [f for f in cls.batch_f
+                       if f[1].__module__ == batch.__name__]
+
+    def test_pep8_conformance_batch(self):
+        """Test that api/v1/views/batch.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_batch(self):
+        """Test that tests/test_api/test_batch.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_batch_module_docstring(self):
+        """Test for the batch.py module docstring"""
+        self.assertIsNot(batch.__doc__, None,
+                         "batch.py needs a docstring")
+        self.assertTrue(len(batch.__doc__) >= 1,
+                        "batch.py needs a docstring")
+
+    def test_batch_func_docstrings(self):
+        """Test for the presence of docstrings in batch functions"""
+        for func in self.batch_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestBatch(unittest.TestCase):
+    """Test the batch view and the helpers it checks operations with"""
+    def setUp(self):
+        """Create a state the operations refer to and a test client"""
+        self.state = State(name="California")
+        self.state.save()
+        self.ids = [("State", self.state.id)]
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Delete the objects the tests stored"""
+        for name, id in reversed(self.ids):
+            obj = storage.get(batch.classes[name], id)
+            if obj is not None:
+                storage.delete(obj)
+        storage.save()
+        storage.close()
+
+    def post(self, ops):
+        """returns the response to a batch of ops, remembering its ids"""
+        response = self.client.post('/api/v1/batch', json=ops)
+        if response.status_code == 200:
+            for op, result in zip(ops, response.get_json()):
+                if result["status"] == 201:
+                    self.ids.append((op["class"], result["id"]))
+        return response
+
+    def test_references(self):
+        """Test the objects operations refer to"""
+        post = {"method": "POST", "class": "City",
+                "data": {"id": "c", "state_id": "s", "name": "SF"}}
+        put = {"method": "PUT", "class": "State", "id": "s",
+               "data": {"name": "CA"}}
+        self.assertEqual(list(batch.references(post)),
+                         [("City", "c"), ("State", "s")])
+        self.assertEqual(list(batch.references(put)), [("State", "s")])
+        for op in [None, [], {"class": "Nope", "data": {}},
+                   {"method": "POST", "class": "State", "data": 1}]:
+            with self.subTest(op=op):
+                self.assertEqual(list(batch.references(op)), [])
+
+    def test_check(self):
+        """Test the status and value check() gives operations"""
+        found = {name: {} for name in batch.classes}
+        found["State"]["s"] = State(id="s", name="CA")
+        created = {name: set() for name in batch.classes}
+        status, value = batch.check(
+            {"method": "POST", "class": "City",
+             "data": {"state_id": "s", "name": "SF"}}, found, created)
+        self.assertEqual(status, 201)
+        self.assertEqual(value["__class__"], "City")
+        self.assertEqual(created["City"], {value["id"]})
+        status, value = batch.check(
+            {"method": "PUT", "class": "State", "id": "s",
+             "data": {"name": "NV", "id": "x", "created_at": "bad"}},
+            found, created)
+        self.assertEqual((status, value),
+                         (200, {"__class__": "State", "id": "s",
+                                "name": "NV"}))
+        bad = [({}, 400), ({"method": "GET", "class": "State", "data": {}},
+                           400),
+               ({"method": "POST", "class": "Nope", "data": {}}, 400),
+               ({"method": "POST", "class": "State", "data": {}}, 400),
+               ({"method": "POST", "class": "City",
+                 "data": {"state_id": "t", "name": "SF"}}, 404),
+               ({"method": "POST", "class": "State",
+                 "data": {"id": 7, "name": "CA"}}, 400),
+               ({"method": "POST", "class": "State",
+                 "data": {"id": "s", "name": "CA"}}, 409),
+               ({"method": "POST", "class": "State",
+                 "data": {"name": "CA", "created_at": "bad"}}, 400),
+               ({"method": "PUT", "class": "State", "id": "t",
+                 "data": {}}, 404)]
+        for op, code in bad:
+            with self.subTest(op=op):
+                self.assertEqual(batch.check(op, found, created)[0], code)
+        self.assertEqual(len(created["State"]), 0)
+
+    def test_empty(self):
+        """Test that an empty batch lists no results"""
+        response = self.post([])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [])
+
+    def test_not_a_list(self):
+        """Test that a batch must be a JSON list"""
+        response = self.client.post('/api/v1/batch', json={})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/v1/batch', data="[",
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch(self):
+        """Test that valid operations apply and invalid ones are skipped"""
+        ops = [{"method": "POST", "class": "State",
+                "data": {"id": "batch-state", "name": "Nevada"}},
+               {"method": "POST", "class": "City",
+                "data": {"state_id": "batch-state", "name": "Reno"}},
+               {"method": "POST", "class": "City",
+                "data": {"state_id": self.state.id, "name": "SF",
+                         "created_at": "bad"}},
+               {"method": "PUT", "class": "State", "id": self.state.id,
+                "data": {"name": "CA"}},
+               {"method": "PUT", "class": "State", "id": "nope",
+                "data": {"name": "CA"}}]
+        response = self.post(ops)
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [201, 201, 400, 200, 404])
+        storage.close()
+        self.assertIsNotNone(storage.get(State, "batch-state"))
+        self.assertIsNotNone(storage.get(City, results[1]["id"]))
+        self.assertEqual(storage.get(State, self.state.id).name, "CA")
+        self.assertEqual([city.name for city in storage.all(City).values()
+                          if city.state_id == self.state.id], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
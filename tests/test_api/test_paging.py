@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Contains the TestPagingDocs and TestPaging classes
+"""
+
+import inspect
+from api.v1.app import app
+from api.v1.views import paging
+import json
+from models import storage
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestPagingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the paging module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.paging_f = inspect.getmembers(paging, inspect.isfunction)
+        cls.paging_f = [f for f in cls.paging_f
+                        if f[1].__module__ == paging.__name__]
+
+    def test_pep8_conformance_paging(self):
+        """Test that api/v1/views/paging.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/paging.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_paging(self):
+        """Test that tests/test_api/test_paging.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_paging.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_paging_module_docstring(self):
+        """Test for the paging.py module docstring"""
+        self.assertIsNot(paging.__doc__, None,
+                         "paging.py needs a docstring")
+        self.assertTrue(len(paging.__doc__) >= 1,
+                        "paging.py needs a docstring")
+
+    def test_paging_func_docstrings(self):
+        """Test for the presence of docstrings in paging functions"""
+        for func in self.paging_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestPaging(unittest.TestCase):
+    """Test the pages and streams of the reviews of a place"""
+    def setUp(self):
+        """Store a place with five reviews and create a test client"""
+        state = State(name="California")
+        city = City(state_id=state.id, name="San Francisco")
+        user = User(email="paging@hbnb.io", password="pwd")
+        place = Place(city_id=city.id, user_id=user.id, name="House")
+        self.reviews = [Review(place_id=place.id, user_id=user.id,
+                               text=str(i)) for i in range(5)]
+        self.objs = [state, city, user, place] + self.reviews
+        for obj in self.objs:
+            obj.save()
+        self.url = '/api/v1/places/{}/reviews'.format(place.id)
+        self.ids = sorted(review.id for review in self.reviews)
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Delete the objects the tests stored"""
+        for obj in reversed(self.objs):
+            obj = storage.get(type(obj), obj.id)
+            if obj is not None:
+                storage.delete(obj)
+        storage.save()
+        storage.close()
+
+    def test_invalid_limit(self):
+        """Test that a limit must be a positive integer"""
+        for limit in ["x", "0", "-1"]:
+            with self.subTest(limit=limit):
+                response = self.client.get(self.url + '?limit=' + limit)
+                self.assertEqual(response.status_code, 400)
+
+    def test_pages(self):
+        """Test that the Link headers lead through every page in id order"""
+        url = self.url + '?limit=2'
+        ids = []
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.get_json()
+            self.assertLessEqual(len(page), 2)
+            ids += [review["id"] for review in page]
+            link = response.headers.get('Link')
+            if link is None:
+                self.assertLess(len(page), 2)
+                url = None
+            else:
+                self.assertTrue(link.endswith('>; rel="next"'))
+                url = link[1:link.index('>')]
+        self.assertEqual(ids, self.ids)
+        response = self.client.get(self.url + '?after=' + self.ids[2])
+        self.assertEqual([review["id"] for review in response.get_json()],
+                         self.ids[3:])
+        self.assertNotIn('Link', response.headers)
+
+    def test_stream(self):
+        """Test that the streamed list, in chunks, is the full list"""
+        criteria = {"place_id": self.reviews[0].place_id}
+        for size in [2, 5, 500]:
+            with self.subTest(chunk=size), \
+                    mock.patch.object(paging, "chunk", size), \
+                    app.test_request_context(self.url):
+                text = "".join(paging.stream(Review, criteria))
+                self.assertEqual([review["id"] for review in
+                                  json.loads(text)], self.ids)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(review["id"] for review in
+                                response.get_json()), self.ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
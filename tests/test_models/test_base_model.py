@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """Test BaseModel for expected behavior and documentation"""
-from datetime import datetime
+from datetime import datetime, timezone
 import inspect
 import models
 from os import remove
@@ -157,6 +157,36 @@ class TestBaseModel(unittest.TestCase):
         string = "[BaseModel] ({}) {}".format(inst.id, inst.__dict__)
         self.assertEqual(string, str(inst))
 
+    def test_time_codec(self):
+        """Test that the timestamp codec matches strftime and strptime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        parse_time = models.base_model.parse_time
+        format_time = models.base_model.format_time
+        for value in [datetime(2017, 9, 28, 21, 3, 54, 52298),
+                      datetime(2017, 9, 28, 21, 3, 54),
+                      datetime(2017, 9, 28, tzinfo=timezone.utc),
+                      datetime.utcnow()]:
+            with self.subTest(value=value):
+                text = value.strftime(t_format)
+                self.assertEqual(format_time(value), text)
+                self.assertEqual(parse_time(text),
+                                 datetime.strptime(text, t_format))
+        old = datetime(999, 1, 2, 3, 4, 5, 6)
+        self.assertEqual(format_time(old), old.strftime(t_format))
+        for text in ["2017-09-28T21:03:54", "2017-09-28T21:03:54.05229Z",
+                     "2017-09-28 21:03:54.052298",
+                     "2017-W39-4T21:03:54.052298", "not a time"]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_time(text)
+
+    def test_datetime_kwargs(self):
+        """Test that datetime values in kwargs are kept as they are"""
+        tic = datetime(2017, 9, 28, 21, 3, 54, 52298)
+        inst = BaseModel(id="1", created_at=tic, updated_at=tic)
+        self.assertEqual(inst.created_at, tic)
+        self.assertEqual(inst.updated_at, tic)
+
     @mock.patch('models.storage')
     def test_save(self, mock_storage):
         """Test that save method updates `updated_at` and calls
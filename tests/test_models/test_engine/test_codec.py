@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+"""
+Contains the TestCodecDocs and TestCodec classes
+"""
+
+from datetime import datetime
+import inspect
+import io
+import json
+from models.engine import codec
+from models.state import State
+import pep8
+import unittest
+BinaryCodec = codec.BinaryCodec
+JSONCodec = codec.JSONCodec
+
+
+class TestCodecDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the codec module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.codec_f = inspect.getmembers(codec, inspect.isfunction) + \
+            inspect.getmembers(JSONCodec, inspect.isfunction) + \
+            inspect.getmembers(BinaryCodec, inspect.isfunction)
+
+    def test_pep8_conformance_codec(self):
+        """Test that models/engine/codec.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/codec.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_codec(self):
+        """Test tests/test_models/test_codec.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_codec.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_codec_module_docstring(self):
+        """Test for the codec.py module docstring"""
+        self.assertIsNot(codec.__doc__, None,
+                         "codec.py needs a docstring")
+        self.assertTrue(len(codec.__doc__) >= 1,
+                        "codec.py needs a docstring")
+
+    def test_codec_class_docstrings(self):
+        """Test for the codec class docstrings"""
+        for cls in [JSONCodec, BinaryCodec]:
+            self.assertIsNot(cls.__doc__, None,
+                             "{:s} needs a docstring".format(cls.__name__))
+            self.assertTrue(len(cls.__doc__) >= 1,
+                            "{:s} needs a docstring".format(cls.__name__))
+
+    def test_codec_func_docstrings(self):
+        """Test for the presence of docstrings in codec functions"""
+        for func in self.codec_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestCodec(unittest.TestCase):
+    """Test the snapshot codecs"""
+    def values(self):
+        """returns entries exercising the fixed width and JSON fields"""
+        state = State(name="Été")
+        return {
+            "State." + state.id: state.to_dict(),
+            "State.not-a-uuid": {"__class__": "State", "id": "not-a-uuid",
+                                 "created_at": "2017-03-25T02:17:06.000000",
+                                 "name": "x"},
+            "City.1": {"__class__": "City", "id": "1",
+                       "created_at": "1969-12-31T23:59:59.999999",
+                       "updated_at": "someday", "list": [1, None]},
+            "BaseModel." + state.id.upper(): {
+                "__class__": "BaseModel", "id": state.id.upper()}}
+
+    def text(self, key, value):
+        """returns value as JSON decoded back, with textual timestamps"""
+        return json.loads("{" + JSONCodec().convert(key, value) + "}")
+
+    def snapshot(self, codec_, values):
+        """returns a file object holding values written with codec_"""
+        data = codec_.join([codec_.convert(key, value)
+                            for key, value in values.items()])
+        if type(data) is str:
+            data = data.encode("utf-8")
+        return io.BytesIO(data)
+
+    def test_uuid_bytes(self):
+        """Test that only canonical UUIDs are stored as 16 bytes"""
+        text = "0123abcd-4567-89ef-0123-456789abcdef"
+        self.assertEqual(codec.uuid_text(codec.uuid_bytes(text)), text)
+        for text in ["0123ABCD-4567-89ef-0123-456789abcdef",
+                     "0123abcd4567-89ef-0123-456789abcdef-", "1", ""]:
+            self.assertIsNone(codec.uuid_bytes(text))
+
+    def test_binary_round_trip(self):
+        """Test that binary entries decode to the values written"""
+        values = self.values()
+        stream = self.snapshot(codec.codecs["binary"], values)
+        found, f = codec.sniff(stream)
+        self.assertIs(found, codec.codecs["binary"])
+        entries = dict(found.iter(f))
+        self.assertEqual(list(entries), list(values))
+        for key, value in entries.items():
+            self.assertEqual(self.text(key, value), self.text(key,
+                                                              values[key]))
+        created = entries["City.1"]["created_at"]
+        self.assertEqual(created, datetime(1969, 12, 31, 23, 59, 59, 999999))
+        self.assertEqual(entries["City.1"]["updated_at"], "someday")
+
+    def test_binary_raw(self):
+        """Test that raw binary entries can be decoded or written back"""
+        binary = codec.codecs["binary"]
+        values = self.values()
+        entries = list(binary.iter(self.skip(binary, values), True))
+        self.assertEqual([key for key, raw in entries], list(values))
+        data = binary.join([binary.part(key, raw) for key, raw in entries])
+        self.assertEqual(data, self.snapshot(binary, values).getvalue())
+        for key, raw in entries:
+            self.assertEqual(binary.decode(raw)["id"], values[key]["id"])
+
+    def skip(self, codec_, values):
+        """returns the snapshot of values positioned after its magic"""
+        f = self.snapshot(codec_, values)
+        f.read(len(codec.magic))
+        return f
+
+    def test_binary_truncated(self):
+        """Test that a truncated binary snapshot is rejected"""
+        binary = codec.codecs["binary"]
+        data = self.snapshot(binary, self.values()).getvalue()
+        for n in [len(codec.magic), len(data) - 4, len(data) - 10]:
+            with self.subTest(n=n):
+                f = io.BytesIO(data[:n])
+                f.read(len(codec.magic))
+                with self.assertRaises(ValueError):
+                    list(binary.iter(f))
+
+    def test_json(self):
+        """Test that JSON snapshots are sniffed and read as before"""
+        values = self.values()
+        found, f = codec.sniff(self.snapshot(codec.codecs["json"], values))
+        self.assertIs(found, codec.codecs["json"])
+        self.assertEqual(dict(found.iter(f)), values)
+        self.assertEqual(json.loads(JSONCodec().join([])), {})
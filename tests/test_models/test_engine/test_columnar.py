@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Contains the TestColumnarDocs and TestColumnar classes
+"""
+
+import inspect
+import json
+from models.engine import columnar
+from models.review import Review
+import os
+import pep8
+import shutil
+import tempfile
+import unittest
+Columnar = columnar.Columnar
+
+
+class TestColumnarDocs(unittest.TestCase):
+    """Tests to check the documentation and style of columnar module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.columnar_f = inspect.getmembers(columnar, inspect.isfunction) + \
+            inspect.getmembers(Columnar, inspect.isfunction)
+
+    def test_pep8_conformance_columnar(self):
+        """Test that models/engine/columnar.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/columnar.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_columnar(self):
+        """Test tests/test_models/test_columnar.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_columnar.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_columnar_module_docstring(self):
+        """Test for the columnar.py module docstring"""
+        self.assertIsNot(columnar.__doc__, None,
+                         "columnar.py needs a docstring")
+        self.assertTrue(len(columnar.__doc__) >= 1,
+                        "columnar.py needs a docstring")
+
+    def test_columnar_class_docstring(self):
+        """Test for the Columnar class docstring"""
+        self.assertIsNot(Columnar.__doc__, None,
+                         "Columnar class needs a docstring")
+        self.assertTrue(len(Columnar.__doc__) >= 1,
+                        "Columnar class needs a docstring")
+
+    def test_columnar_func_docstrings(self):
+        """Test for the presence of docstrings in columnar functions"""
+        for func in self.columnar_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestColumnar(unittest.TestCase):
+    """Test the columnar snapshots"""
+    def setUp(self):
+        """Create a scratch directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "Review.col")
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp)
+
+    def test_rows(self):
+        """Test that rows are grouped by key and read back as JSON"""
+        reviews = [Review(text="été {:d}".format(i),
+                          place_id="p{:d}".format(i % 3))
+                   for i in range(10)] + [Review(text="none")]
+        columnar.write(self.path, reviews, b"source", "place_id")
+        table = Columnar(self.path)
+        self.assertEqual(table.token, b"source")
+        self.assertEqual(table.count, 11)
+        found = json.loads(table.rows())
+        self.assertEqual(sorted(found, key=lambda d: d["id"]),
+                         sorted([r.to_dict() for r in reviews],
+                                key=lambda d: d["id"]))
+        for value in ["p0", "p1", "p2"]:
+            with self.subTest(value=value):
+                expected = [r.to_dict() for r in reviews
+                            if getattr(r, "place_id", None) == value]
+                self.assertEqual(
+                    sorted(json.loads(table.rows(value)),
+                           key=lambda d: d["id"]),
+                    sorted(expected, key=lambda d: d["id"]))
+        self.assertEqual(table.rows("p"), b"[]")
+        self.assertEqual(table.rows("q"), b"[]")
+        self.assertIsInstance(table.id(0), memoryview)
+        ids = {bytes(table.id(k)).decode() for k in range(table.count)}
+        self.assertEqual(ids, {r.id for r in reviews})
+
+    def test_empty(self):
+        """Test a snapshot of no objects"""
+        columnar.write(self.path, [], b"")
+        table = Columnar(self.path)
+        self.assertEqual(table.count, 0)
+        self.assertEqual(table.rows(), b"[]")
+
+    def test_not_a_snapshot(self):
+        """Test that other files are rejected"""
+        with open(self.path, "wb") as f:
+            f.write(b"{}" * 20)
+        with self.assertRaises(ValueError):
+            Columnar(self.path)
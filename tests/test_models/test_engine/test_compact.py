@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompactDocs and TestCompact classes
+"""
+
+import inspect
+import json
+import models
+from models.engine import compact
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+import os
+import pep8
+import shutil
+import tempfile
+import unittest
+compact_class = compact.compact_class
+
+
+class TestCompactDocs(unittest.TestCase):
+    """Tests to check the documentation and style of compact module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.compact_f = inspect.getmembers(compact, inspect.isfunction)
+
+    def test_pep8_conformance_compact(self):
+        """Test that models/engine/compact.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/compact.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_compact(self):
+        """Test tests/test_models/test_compact.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_compact.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_compact_module_docstring(self):
+        """Test for the compact.py module docstring"""
+        self.assertIsNot(compact.__doc__, None,
+                         "compact.py needs a docstring")
+        self.assertTrue(len(compact.__doc__) >= 1,
+                        "compact.py needs a docstring")
+
+    def test_compact_func_docstrings(self):
+        """Test for the presence of docstrings in compact functions"""
+        for func in self.compact_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestCompact(unittest.TestCase):
+    """Test the compact model classes"""
+    def test_same_behavior(self):
+        """Test that compact instances behave like model instances"""
+        place = Place(name="Loft", city_id="1234", number_rooms=3)
+        small = compact_class(Place)(**place.to_dict())
+        self.assertIs(compact_class(Place), type(small))
+        self.assertIs(small.__class__, Place)
+        self.assertIsInstance(small, Place)
+        self.assertEqual(small.to_dict(), place.to_dict())
+        self.assertEqual(small.__dict__, place.__dict__)
+        self.assertEqual(str(small),
+                         "[Place] ({}) {}".format(small.id, small.__dict__))
+        self.assertEqual(small.max_guest, 0)
+        self.assertEqual(small.list_reviews, [])
+        with self.assertRaises(AttributeError):
+            small.unknown
+
+    def test_extra_attributes(self):
+        """Test that attributes outside the model are still accepted"""
+        review = compact_class(Review)(text="Nice")
+        self.assertFalse(hasattr(review, "__weakref__"))
+        review.stars = 5
+        self.assertEqual(review.stars, 5)
+        self.assertEqual(review.to_dict()["stars"], 5)
+        self.assertIn("'stars': 5", str(review))
+
+    def test_file_storage(self):
+        """Test that FileStorage loads compact objects when asked to"""
+        saved = (FileStorage._FileStorage__file_path,
+                 FileStorage._FileStorage__compact)
+        tmp = tempfile.mkdtemp()
+        path = os.path.join(tmp, "file.json")
+        review = Review(text="Quiet", place_id="42")
+        with open(path, "w") as f:
+            json.dump({"Review." + review.id: review.to_dict()}, f)
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__compact = True
+        try:
+            storage = FileStorage()
+            storage.reload()
+            loaded = storage.get(Review, review.id)
+            self.assertIs(type(loaded), compact_class(Review))
+            self.assertEqual(loaded.to_dict(), review.to_dict())
+            self.assertIn("Review." + review.id,
+                          storage.filter(Review, place_id="42"))
+            loaded.text = "Loud"
+            storage.save()
+            with open(path) as f:
+                entry = json.load(f)["Review." + review.id]
+            self.assertEqual(entry["text"], "Loud")
+            storage.delete(loaded)
+        finally:
+            FileStorage._FileStorage__file_path = saved[0]
+            FileStorage._FileStorage__compact = saved[1]
+            shutil.rmtree(tmp)
@@ -4,6 +4,7 @@ Contains the TestDBStorageDocs and TestDBStorage classes
 """
 
 # from datetime import datetime
+import importlib
 import inspect
 import models
 from models.engine import db_storage
@@ -17,7 +18,11 @@ from models.user import User
 # import json
 import os
 import pep8
+import shutil
+from sqlalchemy import event
+import tempfile
 import unittest
+from unittest import mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -76,6 +81,55 @@ test_db_storage.py'])
                             "{:s} method needs a docstring".format(func[0]))
 
 
+class TestDBStorageConfig(unittest.TestCase):
+    """Test the engine settings read from the environment"""
+    def test_engine_url(self):
+        """Test the URL built from HBNB_MYSQL_* and its override"""
+        env = {"HBNB_MYSQL_USER": "u", "HBNB_MYSQL_PWD": "p",
+               "HBNB_MYSQL_HOST": "h", "HBNB_MYSQL_DB": "d"}
+        with mock.patch.dict(os.environ, env):
+            os.environ.pop("HBNB_MYSQL_URL", None)
+            os.environ.pop("HBNB_MYSQL_DRIVER", None)
+            self.assertEqual(db_storage.engine_url(),
+                             "mysql+mysqldb://u:p@h/d")
+            with mock.patch.dict(os.environ,
+                                 {"HBNB_MYSQL_DRIVER": "mysql+pymysql"}):
+                self.assertEqual(db_storage.engine_url(),
+                                 "mysql+pymysql://u:p@h/d")
+            with mock.patch.dict(os.environ,
+                                 {"HBNB_MYSQL_URL": "sqlite://"}):
+                self.assertEqual(db_storage.engine_url(), "sqlite://")
+
+    def test_replica_urls(self):
+        """Test the replica URLs read from HBNB_MYSQL_REPLICA_URLS"""
+        with mock.patch.dict(os.environ, {}):
+            os.environ.pop("HBNB_MYSQL_REPLICA_URLS", None)
+            self.assertEqual(db_storage.replica_urls(), [])
+            os.environ["HBNB_MYSQL_REPLICA_URLS"] = \
+                "sqlite:///a.db, sqlite:///b.db,"
+            self.assertEqual(db_storage.replica_urls(),
+                             ["sqlite:///a.db", "sqlite:///b.db"])
+
+    def test_engine_options(self):
+        """Test the pool options and their defaults"""
+        names = [option[0] for option in db_storage.pool_options] + \
+            ["HBNB_MYSQL_POOL_PRE_PING"]
+        with mock.patch.dict(os.environ, {}):
+            for name in names:
+                os.environ.pop(name, None)
+            self.assertEqual(db_storage.engine_options(),
+                             {"pool_pre_ping": True})
+            os.environ.update({"HBNB_MYSQL_POOL_SIZE": "20",
+                               "HBNB_MYSQL_MAX_OVERFLOW": "5",
+                               "HBNB_MYSQL_POOL_TIMEOUT": "2.5",
+                               "HBNB_MYSQL_POOL_RECYCLE": "3600",
+                               "HBNB_MYSQL_POOL_PRE_PING": "0"})
+            self.assertEqual(db_storage.engine_options(),
+                             {"pool_pre_ping": False, "pool_size": 20,
+                              "max_overflow": 5, "pool_timeout": 2.5,
+                              "pool_recycle": 3600})
+
+
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
@@ -159,3 +213,319 @@ class TestFileStorage(unittest.TestCase):
 
         updated_count = storage.count(User)
         self.assertEqual(updated_count, initial_count + 1)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_stats(self):
+        """Test that the pool metrics are reported"""
+        models.storage.all(State)
+        stats = models.storage.pool_stats()
+        self.assertGreaterEqual(stats["checkouts"], 1)
+        for key in ["connects", "checkins", "waits", "wait_total",
+                    "wait_max", "timeouts"]:
+            self.assertIn(key, stats)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count_queries(self):
+        """Test that count() runs one COUNT query instead of loading rows"""
+        storage = models.storage
+        engine = storage._DBStorage__engine
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            total = storage.count()
+            self.assertEqual(len(statements), 1)
+            self.assertIn("count", statements[0].lower())
+            self.assertEqual(total, len(storage.all()))
+            self.assertEqual(storage.count(State), len(storage.all(State)))
+            self.assertEqual(storage.count("State"), storage.count(State))
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count_cache(self):
+        """Test that cached counts are reused until the next save"""
+        storage = models.storage
+        engine = storage._DBStorage__engine
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+
+        storage._DBStorage__count_ttl = 60
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            states = storage.count(State)
+            storage.count(User)
+            storage.count()
+            self.assertEqual(len(statements), 1)
+            storage.new(State(name="Cached"))
+            storage.save()
+            self.assertEqual(storage.count(State), states + 1)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+            storage._DBStorage__count_ttl = 0
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_filter(self):
+        """Test that filter() selects the rows in the query"""
+        storage = models.storage
+        state = State(name="Filtered")
+        storage.new(state)
+        storage.save()
+        cities = [City(name=str(i), state_id=state.id) for i in range(2)]
+        for city in cities:
+            storage.new(city)
+        storage.save()
+        engine = storage._DBStorage__engine
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            found = storage.filter(City, state_id=state.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        self.assertEqual(set(found), {"City." + c.id for c in cities})
+        self.assertIn("WHERE", statements[-1])
+        self.assertEqual(storage.filter("City", state_id=state.id,
+                                        name="1"),
+                         {"City." + cities[1].id: cities[1]})
+        self.assertEqual(storage.filter(int, id=state.id), {})
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_all_load(self):
+        """Test that loaded relationships cost one query, not one per row"""
+        storage = models.storage
+        for i in range(3):
+            state = State(name="Loaded" + str(i))
+            storage.new(state)
+            storage.save()
+            for j in range(2):
+                storage.new(City(name=str(j), state_id=state.id))
+            storage.save()
+        engine = storage._DBStorage__engine
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+
+        for load in [["cities"], {"cities": "joined"}]:
+            with self.subTest(load=load):
+                storage.close()
+                statements.clear()
+                event.listen(engine, "before_cursor_execute", record)
+                try:
+                    states = storage.all(State, load=load)
+                    cities = sum(len(s.cities) for s in states.values())
+                finally:
+                    event.remove(engine, "before_cursor_execute", record)
+                self.assertEqual(cities, storage.count(City))
+                self.assertLessEqual(len(statements), 2)
+        storage.close()
+        self.assertEqual(len(storage.all(load=["cities"])),
+                         storage.count())
+        with self.assertRaises(AttributeError):
+            storage.all(State, load=["places"])
+        with self.assertRaises(ValueError):
+            storage.all(State, load={"cities": "lazy"})
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pages_load(self):
+        """Test that the web_flask pages listing the cities of every state
+        send as many statements whatever the number of states"""
+        storage = models.storage
+        storage.close()
+        engine = storage._DBStorage__engine
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+
+        def count(client, url):
+            """returns the statements sent to render the page at url"""
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", record)
+            try:
+                response = client.get(url)
+            finally:
+                event.remove(engine, "before_cursor_execute", record)
+            self.assertEqual(response.status_code, 200)
+            return len(statements)
+
+        for name, url in [("8-cities_by_states", "/cities_by_states"),
+                          ("10-hbnb_filters", "/hbnb_filters")]:
+            with self.subTest(page=url):
+                app = importlib.import_module("web_flask." + name).app
+                client = app.test_client()
+                counts = []
+                for i in range(2):
+                    for j in range(3):
+                        state = State(name="Page" + str(j))
+                        storage.new(state)
+                        storage.save()
+                        storage.new(City(name=str(j), state_id=state.id))
+                        storage.save()
+                    storage.close()
+                    counts.append(count(client, url))
+                self.assertEqual(counts[0], counts[1])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_begin(self):
+        """Test that a read-only session reads but refuses to write"""
+        storage = models.storage
+        state = State(name="Written")
+        storage.new(state)
+        storage.save()
+        storage.begin(readonly=True)
+        try:
+            self.assertEqual(storage.get(State, state.id).name, "Written")
+            storage.new(State(name="Refused"))
+            with self.assertRaises(RuntimeError):
+                storage.save()
+        finally:
+            storage.close()
+        self.assertEqual(storage.filter(State, name="Refused"), {})
+        storage.begin()
+        storage.new(State(name="Accepted"))
+        storage.save()
+        storage.close()
+        self.assertEqual(len(storage.filter(State, name="Accepted")), 1)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_read_your_writes(self):
+        """Test that the unit of work after a write reads from the primary
+        for HBNB_MYSQL_READ_YOUR_WRITES seconds, then from the replica"""
+        tmp = tempfile.mkdtemp()
+        urls = ["sqlite:///" + os.path.join(tmp, name)
+                for name in ["primary.db", "replica.db"]]
+        env = {"HBNB_MYSQL_URL": urls[0], "HBNB_MYSQL_REPLICA_URLS": urls[1]}
+        try:
+            for window, found in [(60, True), (0, False)]:
+                with self.subTest(window=window), \
+                        mock.patch.dict(os.environ, env), \
+                        mock.patch.object(DBStorage,
+                                          "_DBStorage__read_your_writes",
+                                          window):
+                    storage = DBStorage()
+                    storage.reload()
+                    replica = storage._DBStorage__replicas[0]
+                    db_storage.Base.metadata.create_all(replica)
+                    storage.begin()
+                    state = State(name="Written")
+                    storage.new(state)
+                    storage.save()
+                    storage.close()
+                    storage.begin(readonly=True)
+                    self.assertEqual(storage.get(State, state.id) is not None,
+                                     found)
+                    storage.close()
+                    storage._DBStorage__engine.dispose()
+                    replica.dispose()
+        finally:
+            shutil.rmtree(tmp)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_create_schema(self):
+        """Test that reload() only creates the tables when asked to"""
+        storage = models.storage
+        with mock.patch.object(db_storage.Base.metadata,
+                               "create_all") as create_all, \
+                mock.patch.dict(os.environ, {}):
+            os.environ.pop("HBNB_ENV", None)
+            storage.reload()
+            self.assertFalse(create_all.called)
+            os.environ["HBNB_MYSQL_CREATE_SCHEMA"] = "0"
+            DBStorage().reload()
+            self.assertFalse(create_all.called)
+            os.environ.pop("HBNB_MYSQL_CREATE_SCHEMA")
+            DBStorage().reload()
+            self.assertEqual(create_all.call_count, 1)
+            storage.create_schema()
+            self.assertEqual(create_all.call_count, 2)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk(self):
+        """Test that bulk writes send one statement per table and kind"""
+        storage = models.storage
+        engine = storage._DBStorage__engine
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement.split()[0].upper())
+
+        states = [State(name="Bulk" + str(i)) for i in range(5)]
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            storage.bulk_new(states)
+            self.assertEqual(statements.count("INSERT"), 1)
+            statements.clear()
+            keys = storage.bulk_upsert(
+                [{"__class__": "State", "id": s.id, "name": "Upserted"}
+                 for s in states[:3]] +
+                [{"__class__": "State", "name": "Bulk" + str(i)}
+                 for i in range(5, 8)])
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        self.assertEqual(statements.count("INSERT"), 1)
+        self.assertEqual(statements.count("UPDATE"), 1)
+        self.assertEqual(keys[:3], ["State." + s.id for s in states[:3]])
+        self.assertEqual(len(set(keys)), 6)
+        storage.close()
+        self.assertEqual(len(storage.filter(State, name="Upserted")), 3)
+        self.assertEqual(storage.get(State, states[0].id).name, "Upserted")
+        for bad in [{"__class__": "Nope"}, {"__class__": "State", "id": 7},
+                    {"__class__": "State", "created_at": "bad"}]:
+            with self.subTest(bad=bad):
+                with self.assertRaises(ValueError):
+                    storage.bulk_upsert([
+                        {"__class__": "State", "name": "Kept"},
+                        {"__class__": "State", "id": states[3].id,
+                         "name": "Changed"}, bad])
+                storage.close()
+                self.assertEqual(storage.filter(State, name="Kept"), {})
+                self.assertEqual(storage.get(State, states[3].id).name,
+                                 "Bulk3")
+        with self.assertRaises(Exception):
+            storage.bulk_new([State(name="Kept"), State(name=None)])
+        storage.close()
+        self.assertEqual(storage.filter(State, name="Kept"), {})
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_many(self):
+        """Test that get_many() reads the objects of many ids at once"""
+        storage = models.storage
+        states = [State(name="Many" + str(i)) for i in range(3)]
+        storage.bulk_new(states)
+        ids = [s.id for s in states[:2]] + ["nope"]
+        self.assertEqual(storage.get_many(State, ids),
+                         {s.id: s for s in states[:2]})
+        self.assertEqual(storage.get_many("State", []), {})
+        self.assertEqual(storage.get_many(int, ids), {})
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page(self):
+        """Test that page() seeks past `after` in id order"""
+        storage = models.storage
+        state = State(name="Paged")
+        storage.new(state)
+        storage.save()
+        cities = [City(id="page-" + str(i), name=str(i), state_id=state.id)
+                  for i in range(5)]
+        storage.bulk_new(cities)
+        self.assertEqual(storage.page(City, 2, "page-1",
+                                      state_id=state.id), cities[2:4])
+        self.assertEqual(storage.page("City", None, "page-3",
+                                      state_id=state.id), cities[4:])
+        self.assertEqual(storage.page(int), [])
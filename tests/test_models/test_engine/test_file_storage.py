@@ -7,6 +7,7 @@ Contains the TestFileStorageDocs classes
 import inspect
 import models
 from models.engine import file_storage
+from models.engine.codec import codecs, magic
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -17,7 +18,13 @@ from models.user import User
 import json
 import os
 import pep8
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -90,7 +97,9 @@ class TestFileStorage(unittest.TestCase):
         """test that new adds an object to the FileStorage.__objects attr"""
         storage = FileStorage()
         save = FileStorage._FileStorage__objects
+        save_classes = FileStorage._FileStorage__classes
         FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
         test_dict = {}
         for key, value in classes.items():
             with self.subTest(key=key, value=value):
@@ -99,7 +108,10 @@ class TestFileStorage(unittest.TestCase):
                 storage.new(instance)
                 test_dict[instance_key] = instance
                 self.assertEqual(test_dict, storage._FileStorage__objects)
+                self.assertEqual({instance_key: instance},
+                                 storage._FileStorage__classes[key])
         FileStorage._FileStorage__objects = save
+        FileStorage._FileStorage__classes = save_classes
 
     def test_save(self):
         """Test that save properly saves objects to file.json"""
@@ -120,6 +132,56 @@ class TestFileStorage(unittest.TestCase):
             js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
 
+    def test_save_dirty_tracking(self):
+        """Test that only changed objects are serialized again on save"""
+        storage = models.storage
+        clean = Place(name="Loft")
+        dirty = Place(name="Barn")
+        storage.new(clean)
+        storage.new(dirty)
+        storage.save()
+        changes = storage._FileStorage__changes
+        fragments = storage._FileStorage__fragments
+        self.assertEqual(changes, {})
+        before = fragments["Place." + clean.id]
+        dirty.name = "Stable"
+        self.assertIs(changes["Place." + dirty.id], dirty)
+        storage.save()
+        self.assertIs(fragments["Place." + clean.id], before)
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js["Place." + dirty.id], dirty.to_dict())
+        self.assertEqual(js["Place." + clean.id], clean.to_dict())
+        storage.delete(clean)
+        storage.delete(dirty)
+        storage.save()
+
+    def test_save_group_commit(self):
+        """Test that concurrent saves are coalesced into valid writes"""
+        storage = models.storage
+        FileStorage._FileStorage__commit_ms = 5
+        users = [User(email=str(i)) for i in range(10)]
+
+        def worker(user):
+            """creates one user"""
+            storage.new(user)
+            storage.save()
+
+        threads = [threading.Thread(target=worker, args=(user,))
+                   for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        FileStorage._FileStorage__commit_ms = 0
+        FileStorage._FileStorage__committer = None
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        for user in users:
+            self.assertEqual(js["User." + user.id], user.to_dict())
+            storage.delete(user)
+        storage.save()
+
     def test_get(self):
         """Test the get() method for retrieving an object by class and id"""
         storage = models.storage
@@ -140,6 +202,134 @@ class TestFileStorage(unittest.TestCase):
             storage.get(User)
             storage.get()
 
+    def test_all_by_class(self):
+        """Test that all(cls) accepts a class or a class name"""
+        storage = models.storage
+        city = City(name="Fremont")
+        storage.new(city)
+        key = "City." + city.id
+        for cls in [City, "City"]:
+            with self.subTest(cls=cls):
+                objs = storage.all(cls)
+                self.assertIs(objs[key], city)
+                self.assertTrue(all(type(o) is City for o in objs.values()))
+                self.assertEqual(len(objs), storage.count(cls))
+        self.assertNotIn(key, storage.all(State))
+        self.assertEqual(storage.all(int), {})
+        self.assertEqual(storage.all(City, load=["places"]), storage.all(City))
+        self.assertEqual(storage.get_many(City, [city.id, "nope", None]),
+                         {city.id: city})
+        storage.all(City).pop(key)
+        self.assertIs(storage.get(City, city.id), city)
+        storage.delete(city)
+        self.assertNotIn(key, storage.all("City"))
+
+    def test_get_uses_index(self):
+        """Test that get() follows new() and delete() through the index"""
+        storage = models.storage
+        obj = State(name="California")
+        self.assertIsNone(storage.get(State, obj.id))
+        storage.new(obj)
+        self.assertIs(storage.get(State, obj.id), obj)
+        self.assertIs(storage.get("State", obj.id), obj)
+        self.assertIsNone(storage.get(City, obj.id))
+        self.assertIn("State." + obj.id,
+                      storage._FileStorage__classes["State"])
+        storage.delete(obj)
+        self.assertIsNone(storage.get(State, obj.id))
+        self.assertNotIn("State." + obj.id,
+                         storage._FileStorage__classes["State"])
+
+    def test_filter(self):
+        """Test that the foreign key indexes follow the stored objects"""
+        storage = models.storage
+        state = State(name="Nevada")
+        other = State(name="Utah")
+        city = City(name="Reno", state_id=state.id)
+        for obj in [state, other, city]:
+            storage.new(obj)
+        self.assertEqual(state.list_cities, [city])
+        self.assertEqual(storage.filter(City, state_id=state.id),
+                         {"City." + city.id: city})
+        self.assertEqual(storage.filter("City", state_id=state.id,
+                                        name="Reno", id=city.id),
+                         {"City." + city.id: city})
+        self.assertEqual(storage.filter(City, state_id=state.id,
+                                        name="Vegas"), {})
+        self.assertEqual(storage.filter(City, id=state.id), {})
+        city.state_id = other.id
+        storage.save()
+        self.assertEqual(state.list_cities, [])
+        self.assertEqual(other.list_cities, [city])
+        city.state_id = state.id
+        city.save()
+        self.assertEqual(state.list_cities, [city])
+        storage.reload()
+        reloaded = storage.get(City, city.id)
+        self.assertIsNot(reloaded, city)
+        self.assertEqual(state.list_cities, [reloaded])
+        storage.delete(reloaded)
+        self.assertEqual(state.list_cities, [])
+        self.assertEqual(storage.filter("City", name="Reno"), {})
+        storage.delete(state)
+        storage.delete(other)
+        storage.save()
+
+    def test_page(self):
+        """Test that pages follow the id order as objects come and go"""
+        storage = models.storage
+        amenities = [Amenity(id="page-" + str(i), name=str(i))
+                     for i in range(5)]
+        for amenity in amenities[1:]:
+            storage.new(amenity)
+        ids = sorted(a.id for a in storage.all(Amenity).values())
+        pages = [storage.page(Amenity, 2)]
+        while pages[-1]:
+            pages.append(storage.page(Amenity, 2, pages[-1][-1].id))
+        self.assertEqual([a.id for page in pages for a in page], ids)
+        self.assertEqual(storage.page(Amenity, 2, "page-1"), amenities[2:4])
+        storage.new(amenities[0])
+        storage.delete(amenities[2])
+        self.assertEqual(storage.page(Amenity, 3, "page-"),
+                         [amenities[0], amenities[1], amenities[3]])
+        self.assertEqual(storage.page(Amenity, None, "page-", name="4"),
+                         [amenities[4]])
+        self.assertEqual(storage.page("Nope"), [])
+        for amenity in amenities:
+            storage.delete(amenity)
+        storage.save()
+
+    def test_page_criteria(self):
+        """Test that pages of a foreign key value follow the id order as
+        objects come, go and change parent"""
+        storage = models.storage
+        reviews = [Review(id="page-" + str(i), place_id="page-place",
+                          text=str(i)) for i in range(6)]
+        for review in reviews[1:]:
+            storage.new(review)
+
+        def ids(**criteria):
+            """returns the ids of the pages of 2 reviews matching criteria"""
+            pages = [storage.page(Review, 2, **criteria)]
+            while pages[-1]:
+                pages.append(storage.page(Review, 2, pages[-1][-1].id,
+                                          **criteria))
+            return [review.id for page in pages for review in page]
+        self.assertEqual(ids(place_id="page-place"),
+                         ["page-" + str(i) for i in range(1, 6)])
+        storage.new(reviews[0])
+        storage.delete(reviews[2])
+        reviews[3].place_id = "page-other"
+        self.assertEqual(ids(place_id="page-place"),
+                         ["page-0", "page-1", "page-4", "page-5"])
+        self.assertEqual(ids(place_id="page-other"), ["page-3"])
+        self.assertEqual(ids(place_id="page-place", text="4"), ["page-4"])
+        self.assertEqual(ids(place_id="page-none"), [])
+        for review in reviews:
+            storage.delete(review)
+        self.assertEqual(ids(place_id="page-place"), [])
+        storage.save()
+
     def test_count(self):
         """
         Test the count() method for counting the number of objects in
@@ -163,3 +353,424 @@ class TestFileStorage(unittest.TestCase):
 
         with self.assertRaises(TypeError):
             storage.count(State, 'fu')
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStoragePersistence(unittest.TestCase):
+    """Test the journal and snapshot recovery of FileStorage"""
+    def setUp(self):
+        """Point the storage at a temporary file in journal mode"""
+        self.saved = {}
+        for attr in ["file_path", "journal", "journal_limit", "backups",
+                     "lazy", "codec", "columnar_dir", "shared", "version",
+                     "refresh_policy", "journal_size"]:
+            self.saved[attr] = getattr(FileStorage, "_FileStorage__" + attr)
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__journal_limit = 100
+
+    def tearDown(self):
+        """Restore the storage settings"""
+        for attr, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + attr, value)
+        shutil.rmtree(self.tmp)
+
+    def test_save_appends(self):
+        """Test that save only appends the changed objects"""
+        storage = FileStorage()
+        state = State(name="Ohio")
+        storage.new(state)
+        storage.save()
+        storage.delete(state)
+        storage.save()
+        self.assertFalse(os.path.exists(self.path))
+        with open(self.path + ".journal") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records, [["State." + state.id, state.to_dict()],
+                                   ["State." + state.id, None]])
+
+    def test_reload_replays(self):
+        """Test that reload applies the journal and drops a torn tail"""
+        storage = FileStorage()
+        kept = State(name="Iowa")
+        gone = State(name="Kansas")
+        with open(self.path + ".journal", "w") as f:
+            for key, value in [("State." + kept.id, kept.to_dict()),
+                               ("State." + gone.id, gone.to_dict()),
+                               ("State." + gone.id, None)]:
+                f.write(json.dumps([key, value]) + "\n")
+            size = f.tell()
+            f.write('["State.torn", {"__cla')
+        storage.reload()
+        self.assertEqual(storage.get(State, kept.id).name, "Iowa")
+        self.assertIsNone(storage.get(State, gone.id))
+        self.assertEqual(os.path.getsize(self.path + ".journal"), size)
+        storage.delete(storage.get(State, kept.id))
+        storage.save()
+
+    def test_compaction(self):
+        """Test that reaching the limit rewrites the snapshot"""
+        FileStorage._FileStorage__journal_limit = 2
+        storage = FileStorage()
+        first = Amenity(name="Wifi")
+        second = Amenity(name="Pool")
+        storage.new(first)
+        storage.save()
+        storage.new(second)
+        storage.save()
+        self.assertEqual(os.path.getsize(self.path + ".journal"), 0)
+        with open(self.path) as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot["Amenity." + second.id], second.to_dict())
+        storage.delete(first)
+        storage.delete(second)
+        storage.save()
+
+    def test_reload_recovers_backup(self):
+        """Test that reload falls back to the newest valid snapshot"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__backups = 2
+        storage = FileStorage()
+        user = User(email="a@b.c")
+        storage.new(user)
+        storage.save()
+        storage.save()
+        with open(self.path, "w") as f:
+            f.write('{"User.')
+        storage.delete(user)
+        with self.assertLogs("models.engine.file_storage", "WARNING") as cm:
+            storage.reload()
+        self.assertIn("recovered", cm.output[-1])
+        self.assertIn(self.path + ".1", cm.output[-1])
+        self.assertEqual(storage.get(User, user.id).email, "a@b.c")
+        storage.delete(storage.get(User, user.id))
+
+    def test_reload_skips_partial_snapshot(self):
+        """Test that nothing of a truncated snapshot is kept when its
+        backup is loaded instead"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__backups = 1
+        x, z, y = [User(id="partial-" + id) for id in "xzy"]
+        entries = {"User." + user.id: user.to_dict() for user in [x, z, y]}
+        with open(self.path + ".1", "w") as f:
+            json.dump({key: entries[key] for key in
+                       ["User.partial-x", "User.partial-y"]}, f)
+        with open(self.path, "w") as f:
+            f.write(json.dumps(entries)[:-20])
+        storage = FileStorage()
+        with self.assertLogs("models.engine.file_storage", "WARNING") as cm:
+            storage.reload()
+        self.assertIn("recovered 2 objects", cm.output[-1])
+        self.assertIsNotNone(storage.get(User, x.id))
+        self.assertIsNotNone(storage.get(User, y.id))
+        self.assertIsNone(storage.get(User, z.id))
+        storage.delete(storage.get(User, x.id))
+        storage.delete(storage.get(User, y.id))
+        storage.save()
+
+    def test_lazy_reload(self):
+        """Test that lazy reload builds objects only when accessed"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__lazy = True
+        storage = FileStorage()
+        state = State(name="Texas")
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        entries = {}
+        for obj in [state] + cities:
+            entries[obj.__class__.__name__ + "." + obj.id] = obj.to_dict()
+        with open(self.path, "w") as f:
+            json.dump(entries, f)
+        count = storage.count()
+        storage.reload()
+        raw = storage._FileStorage__raw
+        self.assertEqual(len(raw["City"]), 3)
+        self.assertEqual(storage.count(), count + 4)
+        cities_count = storage.count(City)
+        loaded = storage.get(State, state.id)
+        self.assertEqual(loaded.to_dict(), state.to_dict())
+        self.assertNotIn("State", raw)
+        self.assertEqual(len(raw["City"]), 3)
+        storage.save()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)["City." + cities[0].id],
+                             cities[0].to_dict())
+        self.assertEqual(len(loaded.list_cities), 3)
+        self.assertNotIn("City", raw)
+        self.assertEqual(cities_count, len(storage.all(City)))
+        for obj in loaded.list_cities + [loaded]:
+            storage.delete(obj)
+
+    def test_reload_interns_ids(self):
+        """Test that loaded ids and foreign keys share one string"""
+        FileStorage._FileStorage__journal = False
+        storage = FileStorage()
+        place = Place(name="Loft")
+        reviews = [Review(text=str(i), place_id=place.id) for i in range(2)]
+        with open(self.path, "w") as f:
+            json.dump({obj.__class__.__name__ + "." + obj.id: obj.to_dict()
+                       for obj in [place] + reviews}, f)
+        storage.reload()
+        loaded = storage.get(Place, place.id)
+        for review in loaded.list_reviews:
+            self.assertIs(review.place_id, loaded.id)
+        created = Review(text="new", place_id="".join(list(place.id)))
+        storage.new(created)
+        self.assertIs(created.place_id, loaded.id)
+        for obj in loaded.list_reviews + [loaded]:
+            storage.delete(obj)
+
+    def test_binary_codec(self):
+        """Test that objects survive a save and reload in binary format"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__codec = codecs["binary"]
+        storage = FileStorage()
+        state = State(name="Utah")
+        city = City(name="Provo", state_id=state.id)
+        city.extra = {"zip": ["84601"], "é": 1.5}
+        for obj in [state, city]:
+            storage.new(obj)
+        storage.save()
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(len(magic)), magic)
+        for lazy in [False, True]:
+            FileStorage._FileStorage__lazy = lazy
+            storage.delete(state)
+            storage.delete(city)
+            storage.reload()
+            loaded = storage.get(City, city.id)
+            self.assertIsNot(loaded, city)
+            self.assertEqual(loaded.to_dict(), city.to_dict())
+            self.assertEqual(storage.get(State, state.id).list_cities,
+                             [loaded])
+        storage.delete(storage.get(State, state.id))
+        storage.delete(loaded)
+        storage.save()
+
+    def test_export_and_load(self):
+        """Test the JSON export and import of a binary snapshot"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__codec = codecs["binary"]
+        storage = FileStorage()
+        user = User(email="x@y.z")
+        storage.new(user)
+        exported = os.path.join(self.tmp, "export.json")
+        storage.export(exported)
+        with open(exported) as f:
+            self.assertEqual(json.load(f)["User." + user.id],
+                             user.to_dict())
+        storage.delete(user)
+        storage.load(exported)
+        self.assertEqual(storage.get(User, user.id).email, "x@y.z")
+        storage.save()
+        storage.delete(storage.get(User, user.id))
+        storage.reload()
+        self.assertEqual(storage.get(User, user.id).to_dict(),
+                         user.to_dict())
+        storage.delete(storage.get(User, user.id))
+        storage.save()
+
+    def test_listing(self):
+        """Test that listing serves the saved objects from the snapshot"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__columnar_dir = self.tmp
+        storage = FileStorage()
+        place = Place(name="Loft")
+        reviews = [Review(text=str(i), place_id=place.id) for i in range(3)]
+        for obj in [place] + reviews:
+            storage.new(obj)
+        self.assertIsNone(storage.listing(Review, "place_id", place.id))
+        storage.save()
+        found = json.loads(storage.listing(Review, "place_id", place.id))
+        self.assertEqual(sorted(r["text"] for r in found), ["0", "1", "2"])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp,
+                                                    "Review.col")))
+        self.assertIsNone(storage.listing(Review, "user_id", "x"))
+        storage.delete(reviews[0])
+        storage.save()
+        found = json.loads(storage.listing(Review, "place_id", place.id))
+        self.assertEqual(sorted(r["text"] for r in found), ["1", "2"])
+        self.assertIn(place.to_dict(), json.loads(storage.listing(Place)))
+        for obj in [place] + reviews[1:]:
+            storage.delete(obj)
+        storage.save()
+        FileStorage._FileStorage__tables.clear()
+
+    def other_process(self, code, journal):
+        """runs code against models.storage in another process"""
+        env = dict(os.environ, HBNB_FILE_SHARED="1",
+                   HBNB_FILE_JOURNAL="1" if journal else "0",
+                   PYTHONPATH=os.path.dirname(os.path.dirname(
+                       os.path.abspath(models.__file__))))
+        env.pop("HBNB_TYPE_STORAGE", None)
+        script = "import models\nfrom models.state import State\n" \
+            "storage = models.storage\n" + code
+        return subprocess.run([sys.executable, "-c", script], cwd=self.tmp,
+                              env=env, check=True, stdout=subprocess.PIPE,
+                              universal_newlines=True).stdout
+
+    def test_listing_behind(self):
+        """Test that a process behind the JSON file does not serve or
+        write a columnar snapshot of its older objects"""
+        FileStorage._FileStorage__shared = True
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__columnar_dir = self.tmp
+        storage = FileStorage()
+        storage.reload()
+        first = User(id="first", email="a", password="p")
+        storage.new(first)
+        storage.save()
+        listed = "import json\nfrom models.user import User\n" \
+            "ids = [u['id'] for u in json.loads(storage.listing(User))]\n" \
+            "print(storage.count(User) == len(ids), " \
+            "{'first', 'second'} <= set(ids))\n"
+        with mock.patch.dict(os.environ, {"HBNB_COLUMNAR_DIR": self.tmp}):
+            self.other_process("from models.user import User\n"
+                               "storage.new(User(id='second', email='b', "
+                               "password='p'))\nstorage.save()\n", False)
+            self.assertIsNone(storage.listing(User))
+            self.assertEqual(self.other_process(listed, False),
+                             "True True\n")
+        storage.refresh()
+        ids = [u["id"] for u in json.loads(storage.listing(User))]
+        self.assertEqual(len(ids), storage.count(User))
+        self.assertLessEqual({"first", "second"}, set(ids))
+        storage.delete(storage.get(User, "first"))
+        storage.delete(storage.get(User, "second"))
+        storage.save()
+        FileStorage._FileStorage__tables.clear()
+
+    def test_shared(self):
+        """Test that processes see each other's writes and deletes"""
+        FileStorage._FileStorage__shared = True
+        storage = FileStorage()
+        for journal in [False, True]:
+            with self.subTest(journal=journal):
+                FileStorage._FileStorage__journal = journal
+                kept = State(name="Kept")
+                gone = State(name="Gone")
+                for obj in [kept, gone]:
+                    storage.new(obj)
+                storage.save()
+                self.other_process(
+                    "storage.delete(storage.get(State, '{}'))\n"
+                    "storage.new(State(id='x', name='Other'))\n"
+                    "storage.save()\n".format(gone.id), journal)
+                storage.close()
+                self.assertIsNone(storage.get(State, gone.id))
+                self.assertEqual(storage.get(State, "x").name, "Other")
+                self.assertEqual(storage.get(State, kept.id).name, "Kept")
+                mine = State(name="Mine")
+                storage.new(mine)
+                self.other_process(
+                    "storage.delete(storage.get(State, 'x'))\n"
+                    "storage.save()\n", journal)
+                storage.save()
+                storage.close()
+                self.assertIsNone(storage.get(State, "x"))
+                self.assertIs(storage.get(State, mine.id), mine)
+                self.other_process(
+                    "assert storage.get(State, 'x') is None\n"
+                    "assert storage.get(State, '{}').name == 'Mine'\n"
+                    .format(mine.id), journal)
+                storage.delete(storage.get(State, kept.id))
+                storage.delete(mine)
+                storage.save()
+
+    def test_refresh_policy(self):
+        """Test that close() reads the file again only as configured"""
+        FileStorage._FileStorage__journal = False
+        storage = FileStorage()
+        state = State(name="Maine")
+        storage.new(state)
+        storage.save()
+        for policy, reread in [("never", False), ("changed", False),
+                               ("always", True)]:
+            with self.subTest(policy=policy):
+                FileStorage._FileStorage__refresh_policy = policy
+                storage.close()
+                self.assertEqual(storage.get(State, state.id) is not state,
+                                 reread)
+                storage.new(state)
+                storage.save()
+        self.other_process("storage.new(State(id='y', name='Other'))\n"
+                           "storage.save()\n", False)
+        for policy, reread in [("never", False), ("changed", True)]:
+            with self.subTest(policy=policy):
+                FileStorage._FileStorage__refresh_policy = policy
+                storage.close()
+                self.assertEqual(storage.get(State, "y") is not None, reread)
+        storage.delete(storage.get(State, "y"))
+        storage.delete(storage.get(State, state.id))
+        storage.save()
+
+    def test_refresh_journal_tail(self):
+        """Test that only the records appended by another process are read"""
+        storage = FileStorage()
+        storage.reload()
+        state = State(name="Idaho")
+        storage.new(state)
+        storage.save()
+        self.other_process("storage.new(State(id='z', name='Other'))\n"
+                           "storage.save()\n", True)
+        storage.close()
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertEqual(storage.get(State, "z").name, "Other")
+        self.other_process("storage.delete(storage.get(State, 'z'))\n"
+                           "storage.save()\n", True)
+        storage.close()
+        self.assertIsNone(storage.get(State, "z"))
+        storage.delete(state)
+        storage.save()
+
+    def test_bulk(self):
+        """Test that bulk_new and bulk_upsert write once per call"""
+        storage = FileStorage()
+        storage.reload()
+        states = [State(name=str(i)) for i in range(3)]
+        flush = storage._FileStorage__flush
+        with mock.patch.object(storage, "_FileStorage__flush",
+                               side_effect=flush) as flushed:
+            storage.bulk_new(states)
+            self.assertEqual(flushed.call_count, 1)
+            updated_at = states[0].updated_at
+            keys = storage.bulk_upsert([
+                {"__class__": "State", "id": states[0].id, "name": "New",
+                 "created_at": "2017-09-28T21:03:54.052298"},
+                {"__class__": "City", "name": "Akron",
+                 "state_id": states[0].id}])
+            self.assertEqual(flushed.call_count, 2)
+        self.assertEqual(keys[0], "State." + states[0].id)
+        self.assertEqual(states[0].name, "New")
+        self.assertNotEqual(states[0].created_at.year, 2017)
+        self.assertGreater(states[0].updated_at, updated_at)
+        city = storage.all(City)[keys[1]]
+        self.assertEqual(list(storage.filter(City, state_id=states[0].id)),
+                         [keys[1]])
+        with open(self.path + ".journal") as f:
+            self.assertEqual(len(f.readlines()), 5)
+        for bad in [{"__class__": "Nope"}, {"__class__": "State", "id": 7},
+                    {"__class__": "State", "created_at": "bad"}, "State"]:
+            with self.subTest(bad=bad):
+                with self.assertRaises(ValueError):
+                    storage.bulk_upsert([
+                        {"__class__": "State", "name": "Kept"},
+                        {"__class__": "State", "id": states[1].id,
+                         "name": "Changed"}, bad])
+                self.assertEqual(storage.filter(State, name="Kept"), {})
+                self.assertEqual(states[1].name, "1")
+        bad = State()
+        bad.__dict__["id"] = 7
+        with self.assertRaises(ValueError):
+            storage.bulk_new([State(name="Kept"), bad])
+        self.assertEqual(storage.filter(State, name="Kept"), {})
+        keys = storage.bulk_upsert([{"__class__": "State", "id": "twice"},
+                                    {"__class__": "State", "id": "twice",
+                                     "name": "Second"}])
+        self.assertEqual(keys, ["State.twice"] * 2)
+        states.append(storage.get(State, "twice"))
+        self.assertEqual(states[-1].name, "Second")
+        for obj in states + [city]:
+            storage.delete(obj)
+        storage.save()
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Contains the TestGroupCommitDocs and TestGroupCommit classes
+"""
+
+import inspect
+from models.engine import group_commit
+import pep8
+import threading
+import time
+import unittest
+GroupCommit = group_commit.GroupCommit
+
+
+class TestGroupCommitDocs(unittest.TestCase):
+    """Tests to check the documentation and style of GroupCommit class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.gc_f = inspect.getmembers(GroupCommit, inspect.isfunction)
+
+    def test_pep8_conformance_group_commit(self):
+        """Test that models/engine/group_commit.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/group_commit.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_group_commit(self):
+        """Test tests/test_models/test_group_commit.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_group_commit.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_group_commit_module_docstring(self):
+        """Test for the group_commit.py module docstring"""
+        self.assertIsNot(group_commit.__doc__, None,
+                         "group_commit.py needs a docstring")
+        self.assertTrue(len(group_commit.__doc__) >= 1,
+                        "group_commit.py needs a docstring")
+
+    def test_group_commit_class_docstring(self):
+        """Test for the GroupCommit class docstring"""
+        self.assertIsNot(GroupCommit.__doc__, None,
+                         "GroupCommit class needs a docstring")
+        self.assertTrue(len(GroupCommit.__doc__) >= 1,
+                        "GroupCommit class needs a docstring")
+
+    def test_gc_func_docstrings(self):
+        """Test for the presence of docstrings in GroupCommit methods"""
+        for func in self.gc_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestGroupCommit(unittest.TestCase):
+    """Test the GroupCommit class"""
+    def test_commits_are_batched(self):
+        """Test that concurrent commits share flushes"""
+        flushes = []
+
+        def flush():
+            """records a flush"""
+            time.sleep(0.01)
+            flushes.append(time.monotonic())
+
+        committer = GroupCommit(flush, interval=0.02, size=1000)
+        done = []
+
+        def worker():
+            """commits once and records when it returned"""
+            committer.commit()
+            done.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(done), 20)
+        self.assertLess(len(flushes), 20)
+        self.assertTrue(all(t >= flushes[0] for t in done))
+
+    def test_size_flushes_early(self):
+        """Test that a full batch does not wait for the interval"""
+        committer = GroupCommit(lambda: None, interval=10, size=1)
+        start = time.monotonic()
+        committer.commit()
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_errors_reach_committers(self):
+        """Test that a failed flush raises in the waiting commits"""
+        def flush():
+            """fails to write"""
+            raise OSError("disk full")
+
+        committer = GroupCommit(flush, interval=0.001)
+        with self.assertRaises(OSError):
+            committer.commit()
+        with self.assertRaises(OSError):
+            committer.commit()
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+"""
+Contains the TestPoolDocs and TestPool classes
+"""
+
+import inspect
+from models.engine import pool
+import os
+import pep8
+import shutil
+from sqlalchemy import create_engine, exc, text
+import tempfile
+import unittest
+PoolStats = pool.PoolStats
+
+
+class TestPoolDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pool module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.pool_f = inspect.getmembers(pool, inspect.isfunction) + \
+            inspect.getmembers(PoolStats, inspect.isfunction)
+
+    def test_pep8_conformance_pool(self):
+        """Test that models/engine/pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pool(self):
+        """Test tests/test_models/test_pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pool_module_docstring(self):
+        """Test for the pool.py module docstring"""
+        self.assertIsNot(pool.__doc__, None,
+                         "pool.py needs a docstring")
+        self.assertTrue(len(pool.__doc__) >= 1,
+                        "pool.py needs a docstring")
+
+    def test_pool_class_docstring(self):
+        """Test for the PoolStats class docstring"""
+        self.assertIsNot(PoolStats.__doc__, None,
+                         "PoolStats class needs a docstring")
+        self.assertTrue(len(PoolStats.__doc__) >= 1,
+                        "PoolStats class needs a docstring")
+
+    def test_pool_func_docstrings(self):
+        """Test for the presence of docstrings in pool functions"""
+        for func in self.pool_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestPool(unittest.TestCase):
+    """Test the pool metrics on a SQLite database"""
+    def setUp(self):
+        """Create an engine with a single pooled connection"""
+        self.tmp = tempfile.mkdtemp()
+        self.stats = PoolStats()
+        self.engine = create_engine(
+            "sqlite:///" + os.path.join(self.tmp, "hbnb.db"),
+            poolclass=pool.timed_pool(self.stats), pool_size=1,
+            max_overflow=0, pool_timeout=0.05)
+        self.stats.attach(self.engine)
+
+    def tearDown(self):
+        """Dispose of the engine and its database"""
+        self.engine.dispose()
+        shutil.rmtree(self.tmp)
+
+    def test_counts(self):
+        """Test that checkouts, checkins and waits are counted"""
+        for i in range(3):
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        stats = self.stats.to_dict(self.engine.pool)
+        self.assertEqual(stats["connects"], 1)
+        self.assertEqual(stats["checkouts"], 3)
+        self.assertEqual(stats["checkins"], 3)
+        self.assertEqual(stats["waits"], 3)
+        self.assertGreaterEqual(stats["wait_max"], 0)
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["checked_out"], 0)
+
+    def test_timeout(self):
+        """Test that a checkout timing out is counted with its wait"""
+        with self.engine.connect():
+            with self.assertRaises(exc.TimeoutError):
+                self.engine.connect()
+            stats = self.stats.to_dict(self.engine.pool)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["checked_out"], 1)
+        self.assertGreaterEqual(stats["wait_max"], 0.05)
+        self.assertEqual(self.stats.to_dict()["waits"], 2)
+        self.assertNotIn("size", self.stats.to_dict())
@@ -0,0 +1,164 @@
+#!/usr/bin/python3
+"""
+Contains the TestRoutingDocs and TestRouting classes
+"""
+
+import inspect
+from models.engine import routing
+import os
+import pep8
+import shutil
+from sqlalchemy import Column, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+import tempfile
+import unittest
+from unittest import mock
+LastWrite = routing.LastWrite
+RoutingSession = routing.RoutingSession
+Base = declarative_base()
+
+
+class Row(Base):
+    """table the routing tests write and read"""
+    __tablename__ = "rows"
+    id = Column(String(60), primary_key=True)
+
+
+class TestRoutingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of routing module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.routing_f = inspect.getmembers(RoutingSession,
+                                           inspect.isfunction)
+        cls.routing_f = [f for f in cls.routing_f
+                         if f[0] in RoutingSession.__dict__]
+
+    def test_pep8_conformance_routing(self):
+        """Test that models/engine/routing.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/routing.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_routing(self):
+        """Test tests/test_models/test_routing.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_routing.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_routing_module_docstring(self):
+        """Test for the routing.py module docstring"""
+        self.assertIsNot(routing.__doc__, None,
+                         "routing.py needs a docstring")
+        self.assertTrue(len(routing.__doc__) >= 1,
+                        "routing.py needs a docstring")
+
+    def test_routing_class_docstring(self):
+        """Test for the RoutingSession class docstring"""
+        self.assertIsNot(RoutingSession.__doc__, None,
+                         "RoutingSession class needs a docstring")
+        self.assertTrue(len(RoutingSession.__doc__) >= 1,
+                        "RoutingSession class needs a docstring")
+
+    def test_routing_func_docstrings(self):
+        """Test for the presence of docstrings in RoutingSession methods"""
+        for func in self.routing_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestRouting(unittest.TestCase):
+    """Test the routing on two SQLite files, a primary and its replica"""
+    def setUp(self):
+        """Create the primary and replica databases, never replicated"""
+        self.tmp = tempfile.mkdtemp()
+        self.primary = create_engine(
+            "sqlite:///" + os.path.join(self.tmp, "primary.db"))
+        self.replica = create_engine(
+            "sqlite:///" + os.path.join(self.tmp, "replica.db"))
+        for engine in [self.primary, self.replica]:
+            Base.metadata.create_all(engine)
+
+    def tearDown(self):
+        """Dispose of the engines and their databases"""
+        self.primary.dispose()
+        self.replica.dispose()
+        shutil.rmtree(self.tmp)
+
+    def session(self, replicas=None, window=0, last_write=None):
+        """returns a routing session over the test databases"""
+        if replicas is None:
+            replicas = [self.replica]
+        return sessionmaker(class_=RoutingSession, primary=self.primary,
+                            replicas=replicas, window=window,
+                            last_write=last_write, expire_on_commit=False)()
+
+    def ids(self, engine):
+        """returns the ids stored in the database of engine"""
+        session = sessionmaker(bind=engine)()
+        try:
+            return {row.id for row in session.query(Row)}
+        finally:
+            session.close()
+
+    def test_writes_go_to_primary(self):
+        """Test that flushes write to the primary, reads use the replica"""
+        session = self.session()
+        self.assertEqual(session.query(Row).count(), 0)
+        session.add(Row(id="1"))
+        session.commit()
+        self.assertEqual(self.ids(self.primary), {"1"})
+        self.assertEqual(self.ids(self.replica), set())
+        self.assertEqual(session.query(Row).count(), 0)
+        session.close()
+
+    def test_transaction_reads_its_writes(self):
+        """Test that a transaction that wrote reads from the primary"""
+        session = self.session()
+        session.add(Row(id="1"))
+        session.flush()
+        self.assertEqual(session.query(Row).count(), 1)
+        session.rollback()
+        self.assertEqual(session.query(Row).count(), 0)
+        self.assertEqual(self.ids(self.primary), set())
+        session.close()
+
+    def test_read_your_writes(self):
+        """Test that reads stay on the primary for window seconds"""
+        session = self.session(window=60)
+        session.add(Row(id="1"))
+        session.commit()
+        self.assertTrue(session.recently_written())
+        self.assertEqual(session.query(Row).count(), 1)
+        with mock.patch.object(routing.time, "monotonic",
+                               return_value=routing.time.monotonic() + 61):
+            self.assertFalse(session.recently_written())
+            self.assertEqual(session.query(Row).count(), 0)
+        session.close()
+
+    def test_shared_window(self):
+        """Test that sessions sharing a last write share its window"""
+        last_write = LastWrite()
+        session = self.session(window=60, last_write=last_write)
+        session.add(Row(id="1"))
+        session.commit()
+        session.close()
+        session = self.session(window=60, last_write=last_write)
+        self.assertEqual(session.query(Row).count(), 1)
+        session.close()
+        session = self.session(window=60)
+        self.assertEqual(session.query(Row).count(), 0)
+        session.close()
+
+    def test_no_replicas(self):
+        """Test that everything runs on the primary without replicas"""
+        session = self.session(replicas=[])
+        session.add(Row(id="1"))
+        session.commit()
+        self.assertEqual(session.query(Row).count(), 1)
+        session.close()
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""
+Contains the TestSnapshotDocs and TestSnapshot classes
+"""
+
+import inspect
+import io
+import json
+from models.engine import snapshot
+import os
+import pep8
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestSnapshotDocs(unittest.TestCase):
+    """Tests to check the documentation and style of snapshot module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.snapshot_f = inspect.getmembers(snapshot, inspect.isfunction)
+
+    def test_pep8_conformance_snapshot(self):
+        """Test that models/engine/snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_snapshot(self):
+        """Test tests/test_models/test_snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_snapshot_module_docstring(self):
+        """Test for the snapshot.py module docstring"""
+        self.assertIsNot(snapshot.__doc__, None,
+                         "snapshot.py needs a docstring")
+        self.assertTrue(len(snapshot.__doc__) >= 1,
+                        "snapshot.py needs a docstring")
+
+    def test_snapshot_func_docstrings(self):
+        """Test for the presence of docstrings in snapshot functions"""
+        for func in self.snapshot_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test the snapshot helpers"""
+    def setUp(self):
+        """Create a scratch directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.tmp)
+
+    def read(self, path):
+        """returns the content of path"""
+        with open(path) as f:
+            return f.read()
+
+    def test_write(self):
+        """Test that write replaces the file and leaves no temporary"""
+        snapshot.write(self.path, "{}")
+        snapshot.write(self.path, '{"a": 1}')
+        self.assertEqual(self.read(self.path), '{"a": 1}')
+        self.assertEqual(os.listdir(self.tmp), ["file.json"])
+
+    def test_rotation(self):
+        """Test that write keeps the requested number of old snapshots"""
+        for n in range(4):
+            snapshot.write(self.path, str(n), backups=2)
+        self.assertEqual(self.read(self.path), "3")
+        self.assertEqual(self.read(self.path + ".1"), "2")
+        self.assertEqual(self.read(self.path + ".2"), "1")
+        self.assertFalse(os.path.exists(self.path + ".3"))
+        self.assertEqual(snapshot.candidates(self.path, 2),
+                         [self.path, self.path + ".1", self.path + ".2"])
+
+    def test_failed_write_keeps_file(self):
+        """Test that a failing write leaves the previous snapshot intact"""
+        snapshot.write(self.path, "old")
+        with mock.patch("os.fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                snapshot.write(self.path, "new")
+        self.assertEqual(self.read(self.path), "old")
+        self.assertEqual(os.listdir(self.tmp), ["file.json"])
+
+    def test_iter_json(self):
+        """Test that iter_json yields every entry whatever the buffer size"""
+        data = {"State.1": {"name": "a}\"{", "ids": [1, 2.5, None]},
+                "City.2": {"name": "été", "n": 12345}}
+        for text in [json.dumps(data), json.dumps(data, indent=4)]:
+            for size in [1, 3, 4096]:
+                with self.subTest(text=text, size=size):
+                    entries = snapshot.iter_json(io.StringIO(text), size)
+                    self.assertEqual(dict(entries), data)
+        self.assertEqual(list(snapshot.iter_json(io.StringIO(" {} "))), [])
+
+    def test_iter_json_raw(self):
+        """Test that iter_json can yield the JSON text of each value"""
+        text = '{"a": {"b": [1, 2]}, "c" : "d"}'
+        entries = list(snapshot.iter_json(io.StringIO(text), 2, raw=True))
+        self.assertEqual(entries, [("a", '{"b": [1, 2]}'), ("c", '"d"')])
+
+    def test_iter_json_errors(self):
+        """Test that iter_json rejects truncated or malformed documents"""
+        for text in ['', '[]', '{"a": {"b": 1}', '{"a" 1}', '{"a": 1 "b"}']:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    list(snapshot.iter_json(io.StringIO(text), 2))
+
+    def test_version(self):
+        """Test that the version follows the file and its journal"""
+        empty = snapshot.version(self.path)
+        snapshot.write(self.path, "{}")
+        first = snapshot.version(self.path)
+        self.assertNotEqual(first, empty)
+        snapshot.write(self.path, "{}")
+        self.assertNotEqual(snapshot.version(self.path), first)
+        first = snapshot.version(self.path)
+        with open(self.path + ".journal", "w") as f:
+            f.write("[]\n")
+        self.assertNotEqual(snapshot.version(self.path), first)
@@ -11,12 +11,18 @@ app = Flask(__name__)
 @app.route('/hbnb_filters', strict_slashes=False)
 def filters():
     """display a HTML page like 6-index.html from static"""
-    states = storage.all("State").values()
+    states = storage.all("State", load=["cities"]).values()
     amenities = storage.all("Amenity").values()
     return render_template('10-hbnb_filters.html', states=states,
                            amenities=amenities)
 
 
+@app.before_request
+def open_db():
+    """opens a read-only storage session for the page"""
+    storage.begin(readonly=True)
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """closes the storage on teardown"""
@@ -15,6 +15,12 @@ def states_list():
     return render_template('7-states_list.html', states=states)
 
 
+@app.before_request
+def open_db():
+    """opens a read-only storage session for the page"""
+    storage.begin(readonly=True)
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """closes the storage on teardown"""
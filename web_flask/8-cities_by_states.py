@@ -11,10 +11,16 @@ app = Flask(__name__)
 @app.route('/cities_by_states', strict_slashes=False)
 def cities_by_states():
     """display the states and cities listed in alphabetical order"""
-    states = storage.all("State").values()
+    states = storage.all("State", load=["cities"]).values()
     return render_template('8-cities_by_states.html', states=states)
 
 
+@app.before_request
+def open_db():
+    """opens a read-only storage session for the page"""
+    storage.begin(readonly=True)
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """closes the storage on teardown"""
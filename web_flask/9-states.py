@@ -18,6 +18,12 @@ def states(state_id=None):
     return render_template('9-states.html', states=states, state_id=state_id)
 
 
+@app.before_request
+def open_db():
+    """opens a read-only storage session for the page"""
+    storage.begin(readonly=True)
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """closes the storage on teardown"""